@@ -0,0 +1,182 @@
+"""
+database 모듈의 비동기 버전입니다.
+
+모든 함수는 DB 전용 스레드 풀(DB_WORKERS개)에서 database의 같은 이름 함수를 실행하므로,
+한 화면에서 서로 관계없는 조회와 solved.ac 요청을 asyncio.gather로 동시에 진행할 수 있습니다.
+(SQLite 호출과 requests 호출은 실행 중에 GIL을 놓으므로 스레드로도 실제로 겹쳐서 실행됨)
+
+Streamlit 스크립트처럼 이벤트 루프가 없는 곳에서는 run()이나 gather()로 실행합니다.
+    stats, problems = async_database.gather(
+        async_database.get_dashboard_stats(user_id, language),
+        async_database.run_in_http(get_problem, level, 10),
+    )
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Awaitable, Coroutine, TypeVar
+
+import database as db
+import profiling
+
+DB_WORKERS = db.POOL_SIZE  # 연결 풀보다 많으면 풀에서 연결을 기다리기만 하므로 같은 크기로 둠
+HTTP_WORKERS = 4
+
+T = TypeVar("T")
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="codedu-db")
+# get_problem 등 네트워크 작업용 (DB 작업이 네트워크 대기에 밀리지 않도록 분리)
+_http_executor = ThreadPoolExecutor(max_workers=HTTP_WORKERS, thread_name_prefix="codedu-http")
+
+
+# run()/gather()를 부른 스레드가 프로파일링 중이면 그 실행의 profiling.Background (코루틴에서 읽음)
+_profile_target: contextvars.ContextVar[Optional[profiling.Background]] = contextvars.ContextVar("codedu_profile_target", default=None)
+
+
+def _submit(executor: ThreadPoolExecutor, kind: str, fn: Callable[..., T], args, kwargs) -> Awaitable[T]:
+    call = functools.partial(fn, *args, **kwargs)
+    target = _profile_target.get()
+    if target is not None:
+        # 스크립트 스레드의 프로파일에는 기다린 시간만 보이므로 작업 스레드에서 따로 프로파일링
+        call = target.wrap(f"{kind}:{getattr(fn, '__module__', '')}.{getattr(fn, '__qualname__', fn)}", call)
+    return asyncio.get_running_loop().run_in_executor(executor, call)
+
+
+async def run_in_db(fn: Callable[..., T], *args, **kwargs) -> T:
+    """fn을 DB 스레드 풀에서 실행합니다. (data_cache의 함수처럼 DB를 읽는 다른 함수에도 사용)"""
+    return await _submit(_db_executor, "db", fn, args, kwargs)
+
+
+async def run_in_http(fn: Callable[..., T], *args, **kwargs) -> T:
+    """fn을 네트워크 작업용 스레드 풀에서 실행합니다."""
+    return await _submit(_http_executor, "http", fn, args, kwargs)
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """run()/gather()가 사용하는 백그라운드 이벤트 루프 (매번 asyncio.run으로 루프를 만드는 비용을 피함)"""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="codedu-async", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    이벤트 루프가 없는 동기 코드(Streamlit 스크립트 등)에서 코루틴을 끝까지 실행하고 결과를 반환합니다.
+    이미 이벤트 루프 안이라면 run() 대신 await를 사용해야 합니다.
+    호출한 스레드가 프로파일링 중이면(profiling.profile_rerun) 스레드 풀에 넘긴 작업도 그 프로파일에 기록합니다.
+    """
+    target = profiling.background()
+    if target is not None:
+        inner = coroutine
+
+        async def profiled():
+            # 이 코루틴에서 만든 작업(asyncio.gather의 Task 등)은 이 값을 물려받음
+            _profile_target.set(target)
+            return await inner
+
+        coroutine = profiled()
+    return asyncio.run_coroutine_threadsafe(coroutine, _get_loop()).result()
+
+
+def gather(*coroutines: Awaitable[Any]) -> list:
+    """여러 코루틴을 동시에 실행하고 결과를 순서대로 반환합니다. (이벤트 루프가 없는 동기 코드용)"""
+    async def main():
+        return await asyncio.gather(*coroutines)
+    return run(main())
+
+
+async def register_user(username: str, password: str, level: str = "초급") -> tuple[bool, str]:
+    """db.register_user의 비동기 버전입니다."""
+    return await run_in_db(db.register_user, username, password, level)
+
+async def verify_user(username: str, password: str) -> tuple[bool, Optional[Dict[str, Any]]]:
+    """db.verify_user의 비동기 버전입니다."""
+    return await run_in_db(db.verify_user, username, password)
+
+async def update_user_level(user_id: int, level: str) -> bool:
+    """db.update_user_level의 비동기 버전입니다."""
+    return await run_in_db(db.update_user_level, user_id, level)
+
+async def update_user_language(user_id: int, language: str) -> bool:
+    """db.update_user_language의 비동기 버전입니다."""
+    return await run_in_db(db.update_user_language, user_id, language)
+
+async def get_user_language(user_id: int) -> Optional[str]:
+    """db.get_user_language의 비동기 버전입니다."""
+    return await run_in_db(db.get_user_language, user_id)
+
+async def save_learning_progress(user_id: int, chapter: str, language: str, completed: bool = False, score: int = 0) -> bool:
+    """db.save_learning_progress의 비동기 버전입니다."""
+    return await run_in_db(db.save_learning_progress, user_id, chapter, language, completed, score)
+
+async def get_learning_progress(user_id: int, language: Optional[str] = None) -> list[Dict[str, Any]]:
+    """db.get_learning_progress의 비동기 버전입니다."""
+    return await run_in_db(db.get_learning_progress, user_id, language)
+
+async def get_user_detail_level(user_id: int, language: str = 'Python') -> int:
+    """db.get_user_detail_level의 비동기 버전입니다."""
+    return await run_in_db(db.get_user_detail_level, user_id, language)
+
+async def update_user_detail_level(user_id: int, detail_level: int, language: str = 'Python') -> bool:
+    """db.update_user_detail_level의 비동기 버전입니다."""
+    return await run_in_db(db.update_user_detail_level, user_id, detail_level, language)
+
+async def get_user_stats(user_id: int, language: Optional[str] = None) -> Dict[str, Any]:
+    """db.get_user_stats의 비동기 버전입니다."""
+    return await run_in_db(db.get_user_stats, user_id, language)
+
+async def get_dashboard_stats(user_id: int, language: Optional[str] = None) -> Dict[str, Any]:
+    """db.get_dashboard_stats의 비동기 버전입니다."""
+    return await run_in_db(db.get_dashboard_stats, user_id, language)
+
+async def save_solved_problem(user_id: int, problem_id: int, problem_title: str, problem_url: str, detail_level: int, language: str = 'Python') -> bool:
+    """db.save_solved_problem의 비동기 버전입니다."""
+    return await run_in_db(db.save_solved_problem, user_id, problem_id, problem_title, problem_url, detail_level, language)
+
+async def rebuild_solved_counters(user_id: Optional[int] = None) -> bool:
+    """db.rebuild_solved_counters의 비동기 버전입니다."""
+    return await run_in_db(db.rebuild_solved_counters, user_id)
+
+async def get_solved_problems_count(user_id: int, detail_level: int, language: Optional[str] = None) -> int:
+    """db.get_solved_problems_count의 비동기 버전입니다."""
+    return await run_in_db(db.get_solved_problems_count, user_id, detail_level, language)
+
+async def get_level_problems_count(user_id: int, level: str, language: Optional[str] = None) -> int:
+    """db.get_level_problems_count의 비동기 버전입니다."""
+    return await run_in_db(db.get_level_problems_count, user_id, level, language)
+
+async def get_solved_problems(user_id: int, detail_level: Optional[int] = None, language: Optional[str] = None) -> list[Dict[str, Any]]:
+    """db.get_solved_problems의 비동기 버전입니다."""
+    return await run_in_db(db.get_solved_problems, user_id, detail_level, language)
+
+async def get_solved_history(user_id: int, limit: int = db.HISTORY_PAGE_SIZE, after: Optional[tuple[str, int]] = None,
+                             detail_level: Optional[int] = None, language: Optional[str] = None,
+                             since=None, until=None) -> tuple[list[Dict[str, Any]], Optional[tuple[str, int]]]:
+    """db.get_solved_history의 비동기 버전입니다."""
+    return await run_in_db(db.get_solved_history, user_id, limit, after, detail_level, language, since, until)
+
+async def is_problem_solved(user_id: int, problem_id: int, detail_level: int, language: Optional[str] = None) -> bool:
+    """db.is_problem_solved의 비동기 버전입니다."""
+    return await run_in_db(db.is_problem_solved, user_id, problem_id, detail_level, language)
+
+async def get_solved_problem_ids(user_id: int, problem_ids: list[int], detail_level: int, language: Optional[str] = None) -> set[int]:
+    """db.get_solved_problem_ids의 비동기 버전입니다."""
+    return await run_in_db(db.get_solved_problem_ids, user_id, problem_ids, detail_level, language)
+
+async def get_review_set(user_id: int, language: str, detail_level: int, day: str) -> Optional[list[tuple[int, str, str]]]:
+    """db.get_review_set의 비동기 버전입니다."""
+    return await run_in_db(db.get_review_set, user_id, language, detail_level, day)
+
+async def save_review_set(user_id: int, language: str, detail_level: int, day: str, problems: list[tuple[int, str, str]]) -> list[tuple[int, str, str]]:
+    """db.save_review_set의 비동기 버전입니다."""
+    return await run_in_db(db.save_review_set, user_id, language, detail_level, day, problems)
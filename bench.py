@@ -0,0 +1,445 @@
+"""
+주요 경로의 성능을 측정합니다.
+
+solved.ac 검색 API를 흉내 내는 로컬 서버를 띄우고, 임시 DB에 가상의 사용자와 풀이 기록을 채운 뒤
+get_problem, 풀이 여부 조회, 통계 조회, 대시보드/학습 화면 전체 렌더링 시간을 측정해
+p50/p95/p99를 출력합니다. 실제 codedu.db와 solved.ac에는 접근하지 않습니다.
+
+사용법:
+    python bench.py [--users 200] [--solved 300] [--iterations 50] [--latency-ms 30]
+                    [--page-size 50] [--match-ratio 1.0] [--pages 20] [--json]
+    python bench.py --logins [--costs pbkdf2_sha256:100000,pbkdf2_sha256:600000,scrypt:16384]
+                    [--sessions 8] [--iterations 50] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Optional, Dict, Any
+
+import async_database
+import database as db
+import catalog
+import passwords
+import problems
+import solvedac_client
+from problem_cache import ProblemCache
+
+LANGUAGES = ["Python", "Java", "C++"]
+
+
+class FakeSolvedAc:
+    """
+    solved.ac의 /api/v3/search/problem을 흉내 내는 로컬 서버입니다.
+    latency: 응답 지연 (초)
+    page_size: 페이지당 문제 수
+    pages: tier당 페이지 수 (이후 페이지는 빈 결과)
+    match_ratio: 페이지에서 요청한 tier와 레벨이 정확히 같은 문제의 비율
+    """
+
+    def __init__(self, latency: float = 0.03, page_size: int = 50, pages: int = 20, match_ratio: float = 1.0):
+        self.latency = latency
+        self.page_size = page_size
+        self.pages = pages
+        self.match_ratio = match_ratio
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # 헤더와 본문 사이의 지연 ACK 대기 방지
+
+            def do_GET(self):
+                parsed = urllib.parse.urlparse(self.path)
+                if parsed.path.rstrip("/") != "/api/v3/search/problem":
+                    self._send(404, b"{}")
+                    return
+                query = urllib.parse.parse_qs(parsed.query)
+                tier = query.get("query", ["tier:bronze5"])[0].partition(":")[2]
+                page = int(query.get("page", ["1"])[0])
+                with fake._lock:
+                    fake.requests += 1
+                time.sleep(fake.latency)
+                self._send(200, json.dumps(fake.page(tier, page), ensure_ascii=False).encode("utf-8"))
+
+            def _send(self, status: int, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/api/v3"
+
+    def page(self, tier: str, page: int) -> Dict[str, Any]:
+        """실제 응답과 비슷한 모양(태그, 다국어 제목 포함)의 검색 결과를 만듭니다."""
+        level = problems.tier_list.index(tier) + 1 if tier in problems.tier_list else 1
+        if page > self.pages:
+            return {"count": self.pages * self.page_size, "items": []}
+
+        rng = random.Random(f"{tier}:{page}")
+        items = []
+        for i in range(self.page_size):
+            problem_id = level * 100000 + page * 1000 + i
+            item_level = level if rng.random() < self.match_ratio else max(1, level - 1)
+            items.append({
+                "problemId": problem_id,
+                "titleKo": f"문제 {problem_id}",
+                "titles": [{"language": "ko", "languageDisplayName": "ko", "title": f"문제 {problem_id}", "isOriginal": True}],
+                "isSolvable": True,
+                "isPartial": False,
+                "acceptedUserCount": 100000 - page * 1000 - i,
+                "level": item_level,
+                "votedUserCount": 10,
+                "sprout": False,
+                "givesNoRating": False,
+                "isLevelLocked": False,
+                "averageTries": 2.5,
+                "official": True,
+                "tags": [{"key": "implementation", "isMeta": False, "bojTagId": 102, "problemCount": 5000,
+                          "displayNames": [{"language": "ko", "name": "구현", "short": "구현"}], "aliases": []}],
+            })
+        return {"count": self.pages * self.page_size, "items": items}
+
+    def start(self) -> "FakeSolvedAc":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def seed_database(path: str, users: int, solved_per_user: int, seed: int = 0) -> list[int]:
+    """임시 DB에 가상의 사용자, 학습 진행 상태, 풀이 기록을 채웁니다. Returns: 사용자 ID 목록"""
+    db.DATABASE_NAME = path
+    rng = random.Random(seed)
+
+    conn = db.get_db_connection()
+    try:
+        cursor = conn.cursor()
+        password_hash = db.hash_password("bench")
+        cursor.executemany(
+            "INSERT INTO users (username, password_hash, level, learning_language) VALUES (?, ?, ?, ?)",
+            [(f"bench{i}", password_hash, "초급", rng.choice(LANGUAGES)) for i in range(users)]
+        )
+        user_ids = [row[0] for row in cursor.execute("SELECT id FROM users WHERE username LIKE 'bench%'")]
+
+        progress = []
+        solved = []
+        for user_id in user_ids:
+            for language in LANGUAGES:
+                for chapter in range(5):
+                    progress.append((user_id, language, f"chapter{chapter}", rng.random() < 0.5, rng.randrange(101), rng.randint(1, 10)))
+            for _ in range(solved_per_user):
+                detail_level = rng.randint(1, 30)
+                problem_id = detail_level * 100000 + rng.randrange(20000)
+                solved.append((user_id, problem_id, f"문제 {problem_id}", f"https://www.acmicpc.net/problem/{problem_id}",
+                               detail_level, rng.choice(LANGUAGES)))
+        cursor.executemany("""
+            INSERT INTO learning_progress (user_id, language, chapter, completed, score, detailLevel)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, progress)
+        cursor.executemany("""
+            INSERT OR IGNORE INTO solved_problems (user_id, problem_id, problem_title, problem_url, detail_level, language)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, solved)
+        conn.commit()
+    finally:
+        conn.close()
+
+    db.rebuild_solved_counters()
+    return user_ids
+
+
+@contextmanager
+def sandbox(fake: FakeSolvedAc):
+    """
+    fake 서버를 띄우고, 그 서버를 쓰는 클라이언트(속도 제한 없음), 메모리 전용 문제 캐시,
+    스냅샷 없음 상태로 바꿔 둡니다. 임시 디렉터리 경로를 넘겨주며, 끝나면 모두 원래대로 되돌립니다.
+    (안에서 db.DATABASE_NAME이나 db.configure_pool로 바꾼 DB 경로, 연결 풀 크기, 저장소 설정 포함)
+    """
+    tmpdir = tempfile.mkdtemp(prefix="codedu-bench-")
+    original_database = db.DATABASE_NAME
+    original_pool = db._pool
+    original_pool_settings = (original_pool.size, original_pool.timeout) if original_pool else (db.POOL_SIZE, db.POOL_TIMEOUT)
+    original_profile = db.STORAGE_PROFILE
+    original_client = solvedac_client._client
+    original_cache = problems.problem_cache
+    fake.start()
+    try:
+        solvedac_client._client = solvedac_client.SolvedAcClient(
+            base_url=fake.url, rate_limiter=solvedac_client.RateLimiter(rate=1e6, burst=10 ** 6))
+        problems.problem_cache = ProblemCache(path=None, serialize=problems.ProblemPage.to_json,
+                                              deserialize=problems.ProblemPage.from_json)
+        catalog.load_catalog(os.path.join(tmpdir, "no-catalog.bin"))
+        yield tmpdir
+    finally:
+        fake.stop()
+        db.close_pool()
+        db.DATABASE_NAME = original_database
+        db.configure_pool(*original_pool_settings, profile=original_profile)
+        solvedac_client._client = original_client
+        problems.problem_cache = original_cache
+        catalog.reload_catalog()
+
+
+def measure(fn: Callable[[], Any], iterations: int, setup: Optional[Callable[[], Any]] = None) -> list[float]:
+    """fn을 iterations번 실행한 시간(초) 목록을 반환합니다. setup은 시간 측정에서 제외됩니다."""
+    timings = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+def summarize(name: str, timings: list[float]) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "n": len(timings),
+        "mean_ms": statistics.fmean(timings) * 1000 if timings else 0.0,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "p99_ms": percentile(timings, 99) * 1000,
+    }
+
+
+def _render_benchmarks(user_ids: list[int], iterations: int, rng: random.Random) -> list[Dict[str, Any]]:
+    """Streamlit AppTest로 대시보드와 학습 화면 전체를 렌더링합니다."""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("streamlit이 설치되어 있지 않아 화면 렌더링 측정은 건너뜁니다.", file=sys.stderr)
+        return []
+
+    import data_cache
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+
+    def render(home_page: bool):
+        user_id = rng.choice(user_ids)
+        at = AppTest.from_file(script, default_timeout=60)
+        at.session_state.logged_in = True
+        at.session_state.user_info = {"id": user_id, "username": f"bench{user_id}", "level": "초급",
+                                      "learning_language": "Python", "detailLevel": rng.randint(1, 10)}
+        at.session_state.learning_language = "Python"
+        at.session_state.home_page = home_page
+        at.session_state.learning_started = not home_page
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    results = []
+    for name, home_page in (("render dashboard", True), ("render learning", False)):
+        render(home_page)  # 처음 한 번은 import 등 준비 비용이 있으므로 제외
+        results.append(summarize(f"{name} (cold data cache)", measure(lambda: render(home_page), iterations, data_cache.cache.clear)))
+        results.append(summarize(f"{name} (warm data cache)", measure(lambda: render(home_page), iterations)))
+    return results
+
+
+def run(users: int = 200, solved_per_user: int = 300, iterations: int = 50, latency: float = 0.03,
+        page_size: int = 50, pages: int = 20, match_ratio: float = 1.0, render: bool = True) -> list[Dict[str, Any]]:
+    """벤치마크 전체를 실행하고 결과 목록을 반환합니다."""
+    rng = random.Random(1)
+    fake = FakeSolvedAc(latency, page_size, pages, match_ratio)
+    results = []
+
+    with sandbox(fake) as tmpdir:
+        started = time.perf_counter()
+        user_ids = seed_database(os.path.join(tmpdir, "bench.db"), users, solved_per_user)
+        print(f"DB 준비: 사용자 {len(user_ids)}명, 풀이 기록 약 {len(user_ids) * solved_per_user}개 "
+              f"({time.perf_counter() - started:.1f}초)", file=sys.stderr)
+
+        def level():
+            return rng.randint(1, 10)
+
+        for concurrent in (False, True):
+            mode = "concurrent" if concurrent else "sequential"
+            requests_before = fake.requests
+            timings = measure(lambda: problems.get_problem(level(), 10, False, concurrent), iterations, problems.problem_cache.clear)
+            result = summarize(f"get_problem ordered, cold cache ({mode})", timings)
+            result["http_requests_per_call"] = (fake.requests - requests_before) / iterations
+            results.append(result)
+
+            requests_before = fake.requests
+            timings = measure(lambda: problems.get_problem(level(), 10, True, concurrent), iterations, problems.problem_cache.clear)
+            result = summarize(f"get_problem random, cold cache ({mode})", timings)
+            result["http_requests_per_call"] = (fake.requests - requests_before) / iterations
+            results.append(result)
+
+        # 학습 화면 문제 목록: solved.ac 요청과 DB 조회를 차례로 vs 동시에
+        def list_data_sequential():
+            detail_level = level()
+            problems.get_problem(detail_level, 10)
+            db.get_solved_problems(rng.choice(user_ids), detail_level, "Python")
+
+        def list_data_gathered():
+            detail_level = level()
+            async_database.gather(
+                async_database.run_in_http(problems.get_problem, detail_level, 10),
+                async_database.get_solved_problems(rng.choice(user_ids), detail_level, "Python"),
+            )
+
+        results.append(summarize("learning list data, cold cache (sequential)",
+                                 measure(list_data_sequential, iterations, problems.problem_cache.clear)))
+        results.append(summarize("learning list data, cold cache (async gather)",
+                                 measure(list_data_gathered, iterations, problems.problem_cache.clear)))
+
+        for detail_level in range(1, 11):
+            problems.get_problem(detail_level, 10)
+        results.append(summarize("get_problem ordered, warm cache",
+                                 measure(lambda: problems.get_problem(level(), 10), iterations)))
+
+        def problem_ids(detail_level):
+            return [detail_level * 100000 + rng.randrange(20000) for _ in range(10)]
+
+        def solved_status_per_problem():
+            user_id, detail_level = rng.choice(user_ids), level()
+            for problem_id in problem_ids(detail_level):
+                db.is_problem_solved(user_id, problem_id, detail_level, "Python")
+
+        def solved_status_batch():
+            user_id, detail_level = rng.choice(user_ids), level()
+            db.get_solved_problem_ids(user_id, problem_ids(detail_level), detail_level, "Python")
+
+        results.append(summarize("write_problem solved status (10x is_problem_solved)", measure(solved_status_per_problem, iterations)))
+        results.append(summarize("write_problem solved status (get_solved_problem_ids)", measure(solved_status_batch, iterations)))
+        results.append(summarize("get_user_stats", measure(lambda: db.get_user_stats(rng.choice(user_ids), "Python"), iterations)))
+        results.append(summarize("get_dashboard_stats", measure(lambda: db.get_dashboard_stats(rng.choice(user_ids), "Python"), iterations)))
+
+        if render:
+            results.extend(_render_benchmarks(user_ids, iterations, rng))
+
+    return results
+
+
+DEFAULT_LOGIN_COSTS = "pbkdf2_sha256:100000,pbkdf2_sha256:300000,pbkdf2_sha256:600000,scrypt:16384"
+
+
+def run_logins(costs: str = DEFAULT_LOGIN_COSTS, sessions: int = 8, logins: int = 50) -> list[Dict[str, Any]]:
+    """
+    비밀번호 비용 설정별로 sessions개의 스레드가 동시에 verify_user를 호출해 초당 로그인 수를 잽니다.
+    costs: "방식:비용" 목록 (pbkdf2_sha256은 반복 횟수, scrypt는 N)
+    해시를 호출한 스레드에서 계산할 때와 스레드/프로세스 풀에서 계산할 때를 비교합니다.
+    """
+    original = (passwords.SCHEME, passwords.PBKDF2_ITERATIONS, passwords.SCRYPT_N, passwords.WORKERS, passwords.POOL)
+    pool_workers = max(1, passwords.WORKERS)
+    results = []
+
+    with sandbox(FakeSolvedAc()) as tmpdir:
+        try:
+            for spec in costs.split(","):
+                scheme, cost = spec.strip().split(":")
+                if scheme == "scrypt":
+                    passwords.configure(scheme=scheme, scrypt_n=int(cost))
+                else:
+                    passwords.configure(scheme=scheme, iterations=int(cost))
+
+                db.DATABASE_NAME = os.path.join(tmpdir, f"logins-{scheme}-{cost}.db")
+                for i in range(sessions):
+                    db.register_user(f"login{i}", "password")
+
+                for workers, pool in ((0, "thread"), (pool_workers, "thread"), (pool_workers, "process")):
+                    passwords.configure(workers=workers, pool=pool)
+                    db.verify_user("login0", "password")  # 작업 프로세스 시작 비용 제외
+                    timings: list[float] = []
+                    lock = threading.Lock()
+
+                    def session_main(index: int):
+                        for _ in range(logins):
+                            started = time.perf_counter()
+                            ok, _ = db.verify_user(f"login{index}", "password")
+                            elapsed = time.perf_counter() - started
+                            if ok:
+                                with lock:
+                                    timings.append(elapsed)
+
+                    threads = [threading.Thread(target=session_main, args=(i,)) for i in range(sessions)]
+                    started = time.perf_counter()
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join()
+                    elapsed = time.perf_counter() - started
+
+                    mode = "inline" if workers == 0 else f"{pool} pool x{workers}"
+                    result = summarize(f"login {scheme}:{cost} ({mode})", timings)
+                    result["logins_per_s"] = len(timings) / elapsed if elapsed else 0.0
+                    results.append(result)
+        finally:
+            scheme, iterations, scrypt_n, workers, pool = original
+            passwords.configure(scheme=scheme, iterations=iterations, scrypt_n=scrypt_n, workers=workers, pool=pool)
+
+    return results
+
+
+def print_table(results: list[Dict[str, Any]]):
+    width = max(len(r["name"]) for r in results)
+    print(f"{'benchmark':<{width}}  {'n':>4}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'http/call':>9}  {'logins/s':>9}")
+    for r in results:
+        http = f"{r['http_requests_per_call']:.1f}" if "http_requests_per_call" in r else "-"
+        logins = f"{r['logins_per_s']:.1f}" if "logins_per_s" in r else "-"
+        print(f"{r['name']:<{width}}  {r['n']:>4}  {r['p50_ms']:>9.2f}  {r['p95_ms']:>9.2f}  {r['p99_ms']:>9.2f}  {http:>9}  {logins:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CodEdu 성능 측정")
+    parser.add_argument("--users", type=int, default=200, help="가상 사용자 수")
+    parser.add_argument("--solved", type=int, default=300, help="사용자당 풀이 기록 수")
+    parser.add_argument("--iterations", type=int, default=50, help="항목별 반복 횟수")
+    parser.add_argument("--latency-ms", type=float, default=30, help="가짜 solved.ac 응답 지연 (ms)")
+    parser.add_argument("--page-size", type=int, default=50, help="페이지당 문제 수")
+    parser.add_argument("--pages", type=int, default=20, help="tier당 결과 페이지 수")
+    parser.add_argument("--match-ratio", type=float, default=1.0, help="페이지에서 레벨이 정확히 일치하는 문제 비율")
+    parser.add_argument("--no-render", action="store_true", help="Streamlit 화면 렌더링 측정 생략")
+    parser.add_argument("--logins", action="store_true", help="비밀번호 비용별 초당 로그인 수만 측정")
+    parser.add_argument("--costs", default=DEFAULT_LOGIN_COSTS, help="--logins에서 비교할 \"방식:비용\" 목록")
+    parser.add_argument("--sessions", type=int, default=8, help="--logins에서 동시에 로그인하는 세션 수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    if args.logins:
+        results = run_logins(args.costs, args.sessions, args.iterations)
+    else:
+        results = run(args.users, args.solved, args.iterations, args.latency_ms / 1000, args.page_size,
+                      args.pages, args.match_ratio, not args.no_render)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print_table(results)
+
+
+if __name__ == "__main__":
+    main()
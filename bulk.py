@@ -0,0 +1,324 @@
+"""
+users, learning_progress, solved_problems 테이블을 파일로 내보내고 가져옵니다.
+
+파일은 한 줄(한 묶음)씩 읽고 쓰므로 전체를 메모리에 올리지 않습니다.
+가져올 때는 CHUNK_SIZE개씩 executemany로 넣고 묶음마다 커밋하므로,
+한 명씩 register_user를 부르는 것보다 훨씬 빠르고 중간에 실패해도 앞 묶음은 남습니다.
+
+형식은 파일 확장자로 정합니다.
+    .csv      : 첫 줄이 열 이름인 CSV (빈 칸은 NULL)
+    .jsonl    : 한 줄에 JSON 객체 하나
+    .parquet  : pyarrow가 설치되어 있을 때만 사용 가능
+
+사용자는 username으로 구분하므로 다른 DB에서 내보낸 파일도 그대로 가져올 수 있습니다.
+    users             : 이미 있는 username은 건너뜀. password_hash 대신 password 열을 주면 해시해서 저장 (명단 등록용)
+                        해시는 일부러 느리게 만든 것이라(passwords 모듈) 명단 등록 속도는 비밀번호 비용과 작업자 수에 달려 있습니다.
+                        manage.py import --password-iterations로 비용을 낮춰 등록해도 첫 로그인 때 현재 비용으로 다시 해시됩니다.
+    learning_progress : 같은 사용자/언어/챕터가 있으면 갱신, 없으면 추가
+    solved_problems   : 같은 사용자/문제/난이도가 있으면 갱신, 없으면 추가 (풀이 수 카운터도 같은 트랜잭션에서 다시 계산)
+    없는 사용자의 기록은 건너뜁니다.
+
+사용법은 manage.py의 import, export 명령을 참고하세요.
+"""
+import csv
+import json
+import os
+import sqlite3
+import time
+from typing import Optional, Dict, Any, Iterable, Iterator
+
+import database as db
+import passwords
+
+CHUNK_SIZE = 1000  # 한 트랜잭션에 넣을 행 수
+
+# 테이블별로 파일에 쓰는 열 (user_id 대신 username)
+COLUMNS: Dict[str, tuple[str, ...]] = {
+    "users": ("username", "password_hash", "level", "learning_language", "created_at", "last_login"),
+    "learning_progress": ("username", "language", "chapter", "completed", "score", "detailLevel", "last_accessed"),
+    "solved_problems": ("username", "problem_id", "problem_title", "problem_url", "detail_level", "language", "solved_at"),
+}
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+class BulkError(Exception):
+    """가져오기/내보내기를 진행할 수 없을 때 발생합니다. (형식 오류, 없는 열 등)"""
+
+
+def detect_format(path: str) -> str:
+    """파일 확장자로 형식을 정합니다."""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension not in FORMATS:
+        raise BulkError(f"지원하지 않는 파일 형식입니다: {path} ({', '.join(FORMATS)} 중 하나)")
+    return extension
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise BulkError("parquet 형식을 사용하려면 pyarrow를 설치하세요. (pip install pyarrow)") from None
+    return pyarrow
+
+
+# ---- 파일 읽기/쓰기 ----
+
+def read_rows(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """파일의 행을 딕셔너리로 하나씩 돌려줍니다."""
+    fmt = fmt or detect_format(path)
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                yield {key: (value if value != "" else None) for key, value in row.items()}
+    elif fmt == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise BulkError(f"{path}:{number}: JSON 형식이 아닙니다 ({e})") from None
+    else:
+        pyarrow = _pyarrow()
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=CHUNK_SIZE):
+            yield from batch.to_pylist()
+
+
+def write_rows(path: str, columns: tuple[str, ...], rows: Iterable[tuple], fmt: Optional[str] = None) -> int:
+    """행(열 순서의 튜플)을 파일에 쓰고 쓴 행 수를 반환합니다."""
+    fmt = fmt or detect_format(path)
+    count = 0
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    elif fmt == "jsonl":
+        with open(path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+                f.write("\n")
+                count += 1
+    else:
+        pyarrow = _pyarrow()
+        writer = None
+        try:
+            for chunk in _chunks(rows, CHUNK_SIZE):
+                table = pyarrow.Table.from_pylist([dict(zip(columns, row)) for row in chunk])
+                if writer is None:
+                    writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+                count += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            # 행이 없어도 열 이름은 남김
+            schema = pyarrow.schema([(column, pyarrow.string()) for column in columns])
+            pyarrow.parquet.write_table(schema.empty_table(), path)
+    return count
+
+
+def _chunks(rows: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---- 내보내기 ----
+
+# 테이블별 조회문 - id 순서로 나눠 읽음 (마지막 열이 다음 묶음의 커서)
+_EXPORT_QUERIES = {
+    "users": """
+        SELECT username, password_hash, level, learning_language, created_at, last_login, id
+        FROM users WHERE id > ? ORDER BY id LIMIT ?
+    """,
+    "learning_progress": """
+        SELECT u.username, p.language, p.chapter, p.completed, p.score, p.detailLevel, p.last_accessed, p.id
+        FROM learning_progress p JOIN users u ON u.id = p.user_id
+        WHERE p.id > ? ORDER BY p.id LIMIT ?
+    """,
+    "solved_problems": """
+        SELECT u.username, s.problem_id, s.problem_title, s.problem_url, s.detail_level, s.language, s.solved_at, s.id
+        FROM solved_problems s JOIN users u ON u.id = s.user_id
+        WHERE s.id > ? ORDER BY s.id LIMIT ?
+    """,
+}
+
+
+def iter_table(table: str, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple]:
+    """
+    테이블의 행을 COLUMNS[table] 순서의 튜플로 하나씩 돌려줍니다.
+    chunk_size개씩 id 순서로 나눠 읽고 묶음마다 연결을 풀에 돌려줍니다.
+    """
+    query = _EXPORT_QUERIES[table]
+    last_id = 0
+    while True:
+        conn = db.get_db_connection()
+        try:
+            rows = conn.execute(query, (last_id, chunk_size)).fetchall()
+        finally:
+            conn.close()
+        for row in rows:
+            yield tuple(row)[:-1]
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][-1]
+
+
+def export_table(table: str, path: str, fmt: Optional[str] = None) -> Dict[str, Any]:
+    """
+    테이블을 파일로 내보냅니다.
+    Returns: {'table', 'rows', 'seconds', 'rows_per_second'}
+    """
+    if table not in COLUMNS:
+        raise BulkError(f"알 수 없는 테이블입니다: {table}")
+    db.flush_writes()
+    started = time.perf_counter()
+    count = write_rows(path, COLUMNS[table], iter_table(table), fmt)
+    return _report(table, count, time.perf_counter() - started)
+
+
+# ---- 가져오기 ----
+
+def _user_rows(chunk: list[Dict[str, Any]]) -> list[tuple]:
+    for row in chunk:
+        if not row.get("username") or (row.get("password_hash") is None and row.get("password") is None):
+            raise BulkError(f"username과 password(또는 password_hash)가 필요합니다: {row}")
+    # 비밀번호 해시는 느리므로 묶음 단위로 작업자에게 나눠 계산
+    hashes = iter(passwords.hash_passwords([str(row["password"]) for row in chunk if row.get("password_hash") is None]))
+    return [(row["username"], row["password_hash"] if row.get("password_hash") is not None else next(hashes),
+             row.get("level"), row.get("learning_language"), row.get("created_at"), row.get("last_login"))
+            for row in chunk]
+
+
+def _import_users(cursor, chunk: list[Dict[str, Any]]) -> int:
+    cursor.executemany("""
+        INSERT INTO users (username, password_hash, level, learning_language, created_at, last_login)
+        VALUES (?, ?, COALESCE(?, '초급'), COALESCE(?, 'Python'), COALESCE(?, CURRENT_TIMESTAMP), ?)
+        ON CONFLICT (username) DO NOTHING
+    """, _user_rows(chunk))
+    return cursor.rowcount
+
+
+def _import_learning_progress(cursor, chunk: list[Dict[str, Any]]) -> int:
+    rows = [(row.get("username"), row.get("language") or "Python", row.get("chapter"),
+             row.get("completed") or 0, row.get("score") or 0, row.get("detailLevel") or 1, row.get("last_accessed"))
+            for row in chunk]
+    # 같은 사용자/언어/챕터가 있으면 갱신 (chapter가 NULL인 detailLevel 행도 IS로 비교)
+    cursor.executemany("""
+        UPDATE learning_progress
+        SET completed = ?, score = ?, detailLevel = ?, last_accessed = COALESCE(?, CURRENT_TIMESTAMP)
+        WHERE user_id = (SELECT id FROM users WHERE username = ?) AND language = ? AND chapter IS ?
+    """, [(*values, username, language, chapter) for username, language, chapter, *values in rows])
+    updated = cursor.rowcount
+    # 없던 행만 추가
+    cursor.executemany("""
+        INSERT INTO learning_progress (user_id, language, chapter, completed, score, detailLevel, last_accessed)
+        SELECT u.id, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP)
+        FROM users u
+        WHERE u.username = ? AND NOT EXISTS (
+            SELECT 1 FROM learning_progress p
+            WHERE p.user_id = u.id AND p.language = ? AND p.chapter IS ?
+        )
+    """, [(language, chapter, *values, username, language, chapter) for username, language, chapter, *values in rows])
+    return updated + cursor.rowcount
+
+
+def _import_solved_problems(cursor, chunk: list[Dict[str, Any]]) -> int:
+    cursor.executemany("""
+        INSERT INTO solved_problems (user_id, problem_id, problem_title, problem_url, detail_level, language, solved_at)
+        SELECT id, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP)
+        FROM users WHERE username = ?
+        ON CONFLICT (user_id, problem_id, detail_level) DO UPDATE SET
+            problem_title = excluded.problem_title,
+            problem_url = excluded.problem_url,
+            language = excluded.language,
+            solved_at = excluded.solved_at
+    """, [(row.get("problem_id"), row.get("problem_title"), row.get("problem_url"), row.get("detail_level"),
+           row.get("language") or "Python", row.get("solved_at"), row.get("username")) for row in chunk])
+    written = cursor.rowcount
+
+    # 이 묶음에 나온 사용자의 카운터를 같은 트랜잭션에서 다시 계산
+    usernames = sorted({row.get("username") for row in chunk if row.get("username")})
+    for start in range(0, len(usernames), 500):
+        part = usernames[start:start + 500]
+        cursor.execute(f"SELECT id FROM users WHERE username IN ({','.join('?' * len(part))})", part)
+        for (user_id,) in cursor.fetchall():
+            db.rebuild_solved_counters_in(cursor, user_id)
+    return written
+
+
+_IMPORTERS = {
+    "users": _import_users,
+    "learning_progress": _import_learning_progress,
+    "solved_problems": _import_solved_problems,
+}
+
+
+def import_rows(table: str, rows: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE,
+                progress=None) -> Dict[str, Any]:
+    """
+    행(딕셔너리)을 chunk_size개씩 한 트랜잭션으로 가져옵니다.
+    sqlite3 오류가 나면 그 묶음은 되돌리고 BulkError를 발생시킵니다. (앞 묶음은 이미 커밋됨)
+    progress를 주면 묶음마다 progress(읽은 행 수)를 호출합니다.
+    Returns: {'table', 'rows', 'written', 'skipped', 'seconds', 'rows_per_second'}
+        skipped - 이미 있는 사용자나 없는 사용자의 기록이라 넣지 않은 행 수
+    """
+    if table not in _IMPORTERS:
+        raise BulkError(f"알 수 없는 테이블입니다: {table}")
+    importer = _IMPORTERS[table]
+    db.flush_writes()
+    started = time.perf_counter()
+    total = written = 0
+
+    conn = db.get_db_connection()
+    cursor = conn.cursor()
+    try:
+        for chunk in _chunks(rows, chunk_size):
+            try:
+                written += importer(cursor, chunk)
+                conn.commit()
+            except BulkError:
+                conn.rollback()
+                raise
+            except sqlite3.Error as e:
+                conn.rollback()
+                db.record_error(f"import_{table}", e)
+                raise BulkError(f"{total + 1}~{total + len(chunk)}번째 행을 가져오지 못했습니다: {e}") from e
+            total += len(chunk)
+            if progress:
+                progress(total)
+    finally:
+        conn.close()
+        # 커밋된 묶음이 있으면 캐시를 비움
+        if total:
+            db.notify_bulk_write(table)
+
+    result = _report(table, total, time.perf_counter() - started)
+    result.update(written=written, skipped=total - written)
+    return result
+
+
+def import_file(table: str, path: str, fmt: Optional[str] = None, chunk_size: int = CHUNK_SIZE,
+                progress=None) -> Dict[str, Any]:
+    """파일을 읽어 import_rows로 가져옵니다."""
+    return import_rows(table, read_rows(path, fmt), chunk_size, progress)
+
+
+def _report(table: str, rows: int, seconds: float) -> Dict[str, Any]:
+    return {
+        "table": table,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else 0.0,
+    }
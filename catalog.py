@@ -0,0 +1,255 @@
+"""
+solved.ac 문제 목록의 로컬 스냅샷을 만들고 읽습니다.
+
+스냅샷은 열(column) 단위로 저장된 바이너리 파일이며, mmap으로 열어서 복사 없이 읽습니다.
+문제는 레벨 순, 같은 레벨 안에서는 푼 사람 수 내림차순(solved.ac의 sort=solved)으로 정렬되고,
+레벨별 시작 위치를 담은 인덱스가 함께 저장됩니다.
+
+사용법:
+    python catalog.py build [--output problem_catalog.bin] [--levels 1-30] [--max-pages N]
+    python catalog.py info [--path problem_catalog.bin]
+"""
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+import time
+from array import array
+from typing import Optional, Callable
+
+CATALOG_PATH = os.environ.get("CODEDU_CATALOG_PATH", "problem_catalog.bin")
+MAGIC = b"CDCAT1\0\0"
+MAX_LEVEL = 30
+PAGE_SIZE = 50  # solved.ac 검색 API의 페이지 크기
+
+# magic, 문제 수, 제목 바이트 길이, 생성 시각, 바이트 순서(0: little, 1: big)
+_HEADER = struct.Struct("<8sIIdI")
+_INDEX_SIZE = MAX_LEVEL + 2  # 레벨 0~30의 시작 위치 + 끝 위치
+
+
+class CatalogError(Exception):
+    """스냅샷 파일을 읽을 수 없을 때 발생합니다."""
+
+
+class ProblemCatalog:
+    """mmap으로 연 문제 스냅샷입니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, count, title_size, built_at, byteorder = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            raise CatalogError(f"스냅샷 파일이 손상되었습니다: {path}")
+        if magic != MAGIC:
+            raise CatalogError(f"스냅샷 파일 형식이 아닙니다: {path}")
+        if byteorder != (0 if sys.byteorder == "little" else 1):
+            raise CatalogError("다른 바이트 순서로 만든 스냅샷입니다. 다시 생성해주세요.")
+
+        self.count = count
+        self.built_at = built_at
+
+        view = memoryview(self._mm)
+        offset = _HEADER.size
+        self._index = view[offset:offset + _INDEX_SIZE * 4].cast("I")
+        offset += _INDEX_SIZE * 4
+        self._ids = view[offset:offset + count * 4].cast("i")
+        offset += count * 4
+        self._levels = view[offset:offset + count]
+        offset += _aligned(count)
+        self._solved = view[offset:offset + count * 4].cast("i")
+        offset += count * 4
+        self._title_offsets = view[offset:offset + (count + 1) * 4].cast("I")
+        offset += (count + 1) * 4
+        self._titles = view[offset:offset + title_size]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def level_range(self, level: int) -> tuple[int, int]:
+        """level에 해당하는 문제의 [시작, 끝) 위치를 반환합니다."""
+        if not 0 <= level <= MAX_LEVEL:
+            return 0, 0
+        return self._index[level], self._index[level + 1]
+
+    def level_count(self, level: int) -> int:
+        """level에 해당하는 문제 수를 반환합니다."""
+        start, end = self.level_range(level)
+        return end - start
+
+    def title(self, i: int) -> str:
+        return bytes(self._titles[self._title_offsets[i]:self._title_offsets[i + 1]]).decode("utf-8")
+
+    def problem(self, i: int) -> tuple[int, str, int, int]:
+        """i번째 문제를 (문제 ID, 제목, 레벨, 푼 사람 수)로 반환합니다."""
+        return self._ids[i], self.title(i), self._levels[i], self._solved[i]
+
+    def problems_for_level(self, level: int, count: int, start: int = 0) -> list[tuple[int, str]]:
+        """level의 문제를 푼 사람 수 순서대로 start번째부터 count개 반환합니다."""
+        begin, end = self.level_range(level)
+        begin = min(begin + start, end)
+        return [(self._ids[i], self.title(i)) for i in range(begin, min(begin + count, end))]
+
+    def sample_level(self, level: int, count: int, page: int, rng: Optional[random.Random] = None) -> list[tuple[int, str]]:
+        """
+        검색 결과의 page번째 페이지에 해당하는 구간에서 count개를 무작위로 뽑습니다.
+        구간의 문제가 count개보다 적으면 마지막 페이지 크기만큼의 구간에서 뽑습니다.
+        """
+        rng = rng or random
+        begin, end = self.level_range(level)
+        lo = begin + (page - 1) * PAGE_SIZE
+        hi = min(end, lo + PAGE_SIZE)
+        if hi - lo < count:
+            lo, hi = max(begin, end - PAGE_SIZE), end
+        picked = rng.sample(range(lo, hi), min(count, hi - lo))
+        return [(self._ids[i], self.title(i)) for i in picked]
+
+    def close(self):
+        for view in (self._index, self._ids, self._levels, self._solved, self._title_offsets, self._titles):
+            view.release()
+        self._mm.close()
+
+
+def _aligned(size: int) -> int:
+    """4바이트 경계에 맞춘 크기를 반환합니다."""
+    return (size + 3) & ~3
+
+
+def write_catalog(path: str, problems: list[tuple[int, str, int, int]]) -> int:
+    """
+    (문제 ID, 제목, 레벨, 푼 사람 수) 목록으로 스냅샷 파일을 만듭니다.
+    읽는 중인 프로세스가 있어도 안전하도록 임시 파일에 쓴 뒤 교체합니다.
+    Returns: 저장한 문제 수
+    """
+    # 레벨 순, 같은 레벨에서는 푼 사람 수 내림차순
+    problems = sorted(problems, key=lambda p: (p[2], -p[3], p[0]))
+    count = len(problems)
+
+    index = array("I", [0] * _INDEX_SIZE)
+    ids = array("i")
+    levels = bytearray()
+    solved = array("i")
+    title_offsets = array("I", [0])
+    titles = bytearray()
+    for problem_id, title, level, solved_count in problems:
+        index[level + 1] += 1
+        ids.append(problem_id)
+        levels.append(level)
+        solved.append(solved_count)
+        titles.extend(title.encode("utf-8"))
+        title_offsets.append(len(titles))
+    for level in range(1, _INDEX_SIZE):
+        index[level] += index[level - 1]
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, count, len(titles), time.time(), 0 if sys.byteorder == "little" else 1))
+        f.write(index.tobytes())
+        f.write(ids.tobytes())
+        f.write(bytes(levels) + b"\0" * (_aligned(count) - count))
+        f.write(solved.tobytes())
+        f.write(title_offsets.tobytes())
+        f.write(titles)
+    os.replace(tmp_path, path)
+    return count
+
+
+def build_catalog(path: str = CATALOG_PATH, levels=range(1, MAX_LEVEL + 1), max_pages: Optional[int] = None,
+                  client=None, progress: Optional[Callable[[str], None]] = None) -> int:
+    """
+    solved.ac에서 각 레벨의 문제를 모두 받아 스냅샷을 만듭니다.
+    Returns: 저장한 문제 수
+    """
+    from solvedac_client import get_client
+    from problems import level_to_tier
+
+    client = client or get_client()
+    seen = {}
+    for level in levels:
+        tier = level_to_tier(level)
+        page = 1
+        while max_pages is None or page <= max_pages:
+            items = client.search_problems(f"tier:{tier}", page).get("items", [])
+            if len(items) == 0:
+                break
+            for p in items:
+                if p["level"] == level:
+                    seen[p["problemId"]] = (p["problemId"], p.get("titleKo") or "", p["level"], p.get("acceptedUserCount") or 0)
+            page += 1
+        if progress:
+            progress(f"{tier}: {page - 1} 페이지, 누적 {len(seen)}문제")
+
+    return write_catalog(path, list(seen.values()))
+
+
+_catalog: Optional[ProblemCatalog] = None
+_catalog_checked = False
+_catalog_lock = threading.Lock()
+
+
+def load_catalog(path: Optional[str] = None) -> Optional[ProblemCatalog]:
+    """
+    스냅샷을 한 번만 열어서 반환합니다.
+    파일이 없거나 읽을 수 없으면 None을 반환합니다.
+    """
+    global _catalog, _catalog_checked
+    if _catalog_checked and path is None:
+        return _catalog
+    with _catalog_lock:
+        if not _catalog_checked or path is not None:
+            try:
+                _catalog = ProblemCatalog(path or CATALOG_PATH)
+            except (OSError, ValueError, CatalogError):
+                _catalog = None
+            _catalog_checked = True
+    return _catalog
+
+
+def reload_catalog() -> Optional[ProblemCatalog]:
+    """스냅샷 파일을 다시 엽니다. (새로 생성한 뒤 호출)"""
+    global _catalog_checked
+    with _catalog_lock:
+        _catalog_checked = False
+    return load_catalog()
+
+
+def _parse_levels(text: str) -> range:
+    start, _, end = text.partition("-")
+    return range(int(start), int(end or start) + 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="solved.ac 문제 스냅샷 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="solved.ac에서 스냅샷을 생성합니다")
+    build.add_argument("--output", default=CATALOG_PATH)
+    build.add_argument("--levels", default=f"1-{MAX_LEVEL}", help="예: 1-10")
+    build.add_argument("--max-pages", type=int, default=None, help="레벨당 최대 페이지 수")
+
+    info = sub.add_parser("info", help="스냅샷 정보를 출력합니다")
+    info.add_argument("--path", default=CATALOG_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.time()
+        count = build_catalog(args.output, _parse_levels(args.levels), args.max_pages, progress=print)
+        print(f"{count}문제를 {args.output}에 저장했습니다. ({time.time() - started:.1f}초)")
+    elif args.command == "info":
+        catalog = ProblemCatalog(args.path)
+        print(f"문제 수: {len(catalog)}")
+        print(f"생성 시각: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(catalog.built_at))}")
+        for level in range(1, MAX_LEVEL + 1):
+            if catalog.level_count(level):
+                print(f"  레벨 {level}: {catalog.level_count(level)}문제")
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
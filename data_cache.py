@@ -0,0 +1,150 @@
+"""
+Streamlit 화면과 database 모듈 사이의 조회 결과 캐시입니다.
+
+결과는 (사용자, 언어) 단위로 보관되며, database의 쓰기 함수가 커밋될 때
+해당 사용자/언어/테이블의 항목만 정확히 무효화됩니다.
+같은 프로세스 안의 쓰기만 감지하므로, 여러 프로세스가 같은 사용자를 동시에 다루는 경우에는
+invalidate_user()로 직접 무효화해야 합니다.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable
+
+import database as db
+import metrics
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class DataCache:
+    """크기가 제한된 LRU 조회 캐시입니다."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # key: (user_id, language, 테이블 목록, 함수 이름, 인자)
+        self._entries: OrderedDict[tuple, Any] = OrderedDict()
+        # 사용자별로 무효화될 때마다 증가 (조회 도중 쓰기가 일어나면 결과를 저장하지 않기 위함)
+        self._generations: Dict[int, int] = {}
+        self._epoch = 0  # 전체 무효화 횟수
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, user_id: int, language: Optional[str], tables: tuple[str, ...],
+                    name: str, args: tuple, loader: Callable[[], Any]) -> Any:
+        """캐시된 결과를 반환하고, 없으면 loader로 조회해서 저장합니다."""
+        key = (user_id, language, tables, name, args)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+            generation = (self._epoch, self._generations.get(user_id, 0))
+
+        value = loader()
+
+        with self._lock:
+            if (self._epoch, self._generations.get(user_id, 0)) == generation:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def invalidate(self, table: str, user_id: Optional[int], language: Optional[str] = None):
+        """
+        table을 읽은 항목 중 user_id/language에 해당하는 것을 지웁니다.
+        user_id가 None이면 모든 사용자, language가 None이면 모든 언어가 대상입니다.
+        언어를 지정하지 않고 조회한 항목은 어떤 언어의 쓰기에도 무효화됩니다.
+        """
+        with self._lock:
+            if user_id is None:
+                self._epoch += 1
+            else:
+                self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+            stale = [
+                key for key in self._entries
+                if table in key[2]
+                and (user_id is None or key[0] == user_id)
+                and (language is None or key[1] is None or key[1] == language)
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def invalidate_user(self, user_id: int):
+        """사용자의 모든 항목을 지웁니다."""
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Streamlit은 매 상호작용마다 스크립트를 다시 실행하므로 캐시는 이 모듈에 둡니다.
+cache = DataCache()
+db.add_write_listener(cache.invalidate)
+metrics.register_collector(lambda: [
+    ("data_cache_hits", {}, cache.hits),
+    ("data_cache_misses", {}, cache.misses),
+    ("data_cache_entries", {}, len(cache)),
+])
+
+
+def get_user_stats(user_id: int, language: Optional[str] = None) -> Dict[str, Any]:
+    """캐시를 거치는 db.get_user_stats입니다."""
+    return cache.get_or_load(user_id, language, ("learning_progress",), "get_user_stats", (),
+                             lambda: db.get_user_stats(user_id, language))
+
+def get_dashboard_stats(user_id: int, language: Optional[str] = None) -> Dict[str, Any]:
+    """캐시를 거치는 db.get_dashboard_stats입니다."""
+    return cache.get_or_load(user_id, language, ("learning_progress", "solved_problems"), "get_dashboard_stats", (),
+                             lambda: db.get_dashboard_stats(user_id, language))
+
+def get_learning_progress(user_id: int, language: Optional[str] = None) -> list[Dict[str, Any]]:
+    """캐시를 거치는 db.get_learning_progress입니다."""
+    return cache.get_or_load(user_id, language, ("learning_progress",), "get_learning_progress", (),
+                             lambda: db.get_learning_progress(user_id, language))
+
+def get_user_detail_level(user_id: int, language: str = 'Python') -> int:
+    """캐시를 거치는 db.get_user_detail_level입니다."""
+    return cache.get_or_load(user_id, language, ("learning_progress",), "get_user_detail_level", (),
+                             lambda: db.get_user_detail_level(user_id, language))
+
+def get_user_language(user_id: int) -> Optional[str]:
+    """캐시를 거치는 db.get_user_language입니다."""
+    return cache.get_or_load(user_id, None, ("users",), "get_user_language", (),
+                             lambda: db.get_user_language(user_id))
+
+def get_solved_problems_count(user_id: int, detail_level: int, language: Optional[str] = None) -> int:
+    """캐시를 거치는 db.get_solved_problems_count입니다."""
+    return cache.get_or_load(user_id, language, ("solved_problems",), "get_solved_problems_count", (detail_level,),
+                             lambda: db.get_solved_problems_count(user_id, detail_level, language))
+
+def get_level_problems_count(user_id: int, level: str, language: Optional[str] = None) -> int:
+    """캐시를 거치는 db.get_level_problems_count입니다."""
+    return cache.get_or_load(user_id, language, ("solved_problems",), "get_level_problems_count", (level,),
+                             lambda: db.get_level_problems_count(user_id, level, language))
+
+def get_solved_problems(user_id: int, detail_level: Optional[int] = None, language: Optional[str] = None) -> list[Dict[str, Any]]:
+    """캐시를 거치는 db.get_solved_problems입니다."""
+    return cache.get_or_load(user_id, language, ("solved_problems",), "get_solved_problems", (detail_level,),
+                             lambda: db.get_solved_problems(user_id, detail_level, language))
+
+def is_problem_solved(user_id: int, problem_id: int, detail_level: int, language: Optional[str] = None) -> bool:
+    """캐시를 거치는 db.is_problem_solved입니다."""
+    return cache.get_or_load(user_id, language, ("solved_problems",), "is_problem_solved", (problem_id, detail_level),
+                             lambda: db.is_problem_solved(user_id, problem_id, detail_level, language))
+
+def get_solved_problem_ids(user_id: int, problem_ids: list[int], detail_level: int, language: Optional[str] = None) -> set[int]:
+    """캐시를 거치는 db.get_solved_problem_ids입니다."""
+    return cache.get_or_load(user_id, language, ("solved_problems",), "get_solved_problem_ids", (tuple(problem_ids), detail_level),
+                             lambda: db.get_solved_problem_ids(user_id, problem_ids, detail_level, language))
@@ -1,21 +1,549 @@
 import sqlite3
-import hashlib
-from datetime import datetime
+import json
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 
+import metrics
+import passwords
+
 DATABASE_NAME = "codedu.db"
+POOL_SIZE = 8  # 프로세스당 최대 연결 수
+POOL_TIMEOUT = 10.0  # 모든 연결이 사용 중일 때 기다릴 최대 시간 (초)
+HEALTH_CHECK_INTERVAL = 30.0  # 이 시간 이상 쉬었던 연결은 꺼낼 때 상태를 확인 (초)
+HISTORY_PAGE_SIZE = 50  # get_solved_history 기본 페이지 크기
+HISTORY_BATCH_SIZE = 500  # iter_solved_problems가 한 번에 읽는 행 수
 
-def get_db_connection():
-    """데이터베이스 연결을 반환합니다."""
-    conn = sqlite3.connect(DATABASE_NAME)
-    conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
-    return conn
+# 연결할 때 적용하는 저장소 설정
+# checkpoint_interval: WAL 내용을 본 DB 파일로 옮기는 주기 (초, None이면 SQLite 자동 체크포인트만 사용)
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    # 여러 학생이 동시에 사용하는 실습 환경 (기본값)
+    # WAL이므로 읽기는 쓰기를 기다리지 않으며, NORMAL이면 정전 시 마지막 커밋 일부만 잃을 수 있음
+    "concurrent": {
+        "journal_mode": "WAL",
+        "busy_timeout": 5000,  # 잠금 대기 시간 (ms)
+        "synchronous": "NORMAL",
+        "cache_size": -16000,  # 16MB (음수는 KiB 단위)
+        "mmap_size": 128 * 1024 * 1024,
+        "wal_autocheckpoint": 1000,  # 페이지 수
+        "checkpoint_interval": 60.0,
+    },
+    # 커밋마다 fsync하여 정전에도 커밋을 잃지 않음
+    "durable": {
+        "journal_mode": "WAL",
+        "busy_timeout": 5000,
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 128 * 1024 * 1024,
+        "wal_autocheckpoint": 1000,
+        "checkpoint_interval": 60.0,
+    },
+    # SQLite 기본 설정 (롤백 저널), 잠금 대기 시간만 지정
+    "legacy": {
+        "journal_mode": "DELETE",
+        "busy_timeout": 5000,
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "wal_autocheckpoint": 1000,
+        "checkpoint_interval": None,
+    },
+}
+STORAGE_PROFILE = os.environ.get("CODEDU_DB_PROFILE", "concurrent")
+
+# 학습 수준별 detail_level 범위
+LEVEL_DETAIL_RANGES = {
+    "초급": (1, 10),
+    "중급": (11, 20),
+    "고급": (21, 30),
+}
+
+class PooledConnection(sqlite3.Connection):
+    """close()를 호출하면 실제로 닫지 않고 풀에 반환하는 연결입니다."""
+
+    def close(self):
+        pool = getattr(self, "pool", None)
+        if pool is not None:
+            pool.release(self)
+        else:
+            super().close()
+
+    def close_connection(self):
+        """연결을 실제로 닫습니다."""
+        sqlite3.Connection.close(self)
+
+class ConnectionPool:
+    """
+    스레드 간에 공유하는 SQLite 연결 풀입니다.
+    최근에 반환된 연결부터 다시 사용하므로 페이지 캐시가 유지됩니다.
+    """
+
+    def __init__(self, database: str, size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT,
+                 profile: Optional[Dict[str, Any]] = None):
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        self.profile = profile or STORAGE_PROFILES[STORAGE_PROFILE]
+        self._last_checkpoint = time.monotonic()
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self.waits = 0  # 모든 연결이 사용 중이어서 기다린 횟수
+        self.wait_time = 0.0  # 기다린 시간 합계 (초)
+
+    def _connect(self) -> PooledConnection:
+        profile = self.profile
+        conn = sqlite3.connect(self.database, factory=PooledConnection, check_same_thread=False,
+                               timeout=profile["busy_timeout"] / 1000)
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {int(profile['busy_timeout'])}")
+            conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+            conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+            conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+            conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+            conn.execute(f"PRAGMA wal_autocheckpoint = {int(profile['wal_autocheckpoint'])}")
+        except sqlite3.Error:
+            conn.close_connection()
+            raise
+        conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+        conn.pool = self
+        conn.released_at = time.monotonic()
+        return conn
+
+    def _discard(self, conn: PooledConnection):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close_connection()
+        except sqlite3.Error:
+            pass
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        if time.monotonic() - conn.released_at < HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self) -> PooledConnection:
+        """연결을 꺼냅니다. 모든 연결이 사용 중이면 timeout까지 기다립니다."""
+        while True:
+            if self._closed:
+                raise sqlite3.OperationalError("connection pool is closed")
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        return self._connect()
+                    except sqlite3.Error as e:
+                        _record_error("connect", e)
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                started = time.monotonic()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise sqlite3.OperationalError("connection pool exhausted")
+                finally:
+                    with self._lock:
+                        self.waits += 1
+                        self.wait_time += time.monotonic() - started
+
+            if self._is_healthy(conn):
+                return conn
+            self._discard(conn)
+
+    def release(self, conn: PooledConnection):
+        """연결을 풀에 반환합니다. 끝나지 않은 트랜잭션은 롤백합니다."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        if self._closed:
+            self._discard(conn)
+            return
+        conn.released_at = time.monotonic()
+        self._maybe_checkpoint(conn)
+        self._idle.put(conn)
+
+    def _maybe_checkpoint(self, conn: PooledConnection):
+        """checkpoint_interval이 지났으면 WAL 체크포인트를 실행합니다. (다른 연결을 막지 않음)"""
+        interval = self.profile.get("checkpoint_interval")
+        if interval is None or conn.released_at - self._last_checkpoint < interval:
+            return
+        self._last_checkpoint = conn.released_at
+        try:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        """쉬고 있는 연결을 모두 닫고, 사용 중인 연결은 반환될 때 닫습니다."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """현재 DATABASE_NAME에 대한 연결 풀을 반환합니다."""
+    global _pool
+    pool = _pool
+    if pool is None or pool.database != DATABASE_NAME:
+        with _pool_lock:
+            if _pool is None or _pool.database != DATABASE_NAME:
+                if _pool is not None:
+                    _pool.close()
+                _pool = ConnectionPool(DATABASE_NAME)
+            pool = _pool
+    return pool
 
-def init_database():
-    """데이터베이스 테이블을 초기화합니다."""
+def configure_pool(size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT, profile: Optional[str] = None):
+    """연결 풀의 크기, 대기 시간, 저장소 설정을 지정합니다. (기존 연결은 닫힘)"""
+    global _pool, STORAGE_PROFILE
+    with _pool_lock:
+        if profile is not None:
+            if profile not in STORAGE_PROFILES:
+                raise ValueError(f"알 수 없는 저장소 설정입니다: {profile}")
+            STORAGE_PROFILE = profile
+        if _pool is not None:
+            _pool.close()
+        _pool = ConnectionPool(DATABASE_NAME, size, timeout)
+
+@metrics.timed("db.checkpoint")
+def checkpoint(mode: str = "PASSIVE") -> bool:
+    """WAL 체크포인트를 바로 실행합니다. (mode: PASSIVE, FULL, RESTART, TRUNCATE)"""
+    if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+        raise ValueError(f"알 수 없는 체크포인트 모드입니다: {mode}")
     conn = get_db_connection()
-    cursor = conn.cursor()
     
+    try:
+        conn.execute(f"PRAGMA wal_checkpoint({mode})")
+        return True
+    except sqlite3.Error as e:
+        _record_error("checkpoint", e)
+        return False
+    finally:
+        conn.close()
+
+def close_pool():
+    """연결 풀을 닫습니다. (프로세스 종료 시 자동 호출)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+atexit.register(close_pool)
+
+# 쓰기가 커밋된 뒤 호출할 함수 목록 - fn(table, user_id, language)
+# language가 None이면 해당 사용자의 모든 언어가 영향을 받았다는 뜻
+_write_listeners: list = []
+
+def add_write_listener(listener):
+    """쓰기가 커밋될 때마다 호출될 함수를 등록합니다. (캐시 무효화 등)"""
+    _write_listeners.append(listener)
+
+def remove_write_listener(listener):
+    """등록한 쓰기 알림 함수를 제거합니다."""
+    if listener in _write_listeners:
+        _write_listeners.remove(listener)
+
+def _notify_write(table: str, user_id: Optional[int], language: Optional[str] = None):
+    for listener in list(_write_listeners):
+        listener(table, user_id, language)
+
+def notify_bulk_write(table: str):
+    """여러 사용자의 행을 한꺼번에 쓴 뒤(일괄 가져오기 등) 모든 사용자가 영향을 받았다고 알립니다."""
+    _notify_write(table, None)
+
+# 아래 함수들은 sqlite3 오류가 나면 False/None/0을 반환하므로, 삼킨 오류를 여기에 셉니다.
+_error_counts: Dict[str, int] = {}
+_locked_errors = 0  # busy_timeout 안에 잠금을 얻지 못한 횟수 (database is locked)
+_error_lock = threading.Lock()
+
+def _record_error(operation: str, error: Exception):
+    global _locked_errors
+    message = str(error).lower()
+    with _error_lock:
+        _error_counts[operation] = _error_counts.get(operation, 0) + 1
+        if isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message):
+            _locked_errors += 1
+
+def record_error(operation: str, error: Exception):
+    """이 모듈 밖에서 삼킨 sqlite3 오류도 get_error_counts()에 함께 셉니다."""
+    _record_error(operation, error)
+
+def get_error_counts() -> Dict[str, Any]:
+    """
+    삼킨 sqlite3 오류 횟수를 반환합니다.
+    Returns: {'errors': {함수 이름: 횟수}, 'locked': 잠금 시간 초과 횟수}
+    """
+    with _error_lock:
+        return {'errors': dict(_error_counts), 'locked': _locked_errors}
+
+def reset_error_counts():
+    """오류 횟수를 0으로 되돌립니다."""
+    global _locked_errors
+    with _error_lock:
+        _error_counts.clear()
+        _locked_errors = 0
+
+# 쓰기 지연(write-behind) 모드 - 켜면 풀이 기록과 마지막 로그인 시간을 백그라운드에서 모아서 저장
+WRITE_BEHIND = os.environ.get("CODEDU_WRITE_BEHIND", "0") == "1"
+WRITE_BEHIND_FLUSH_INTERVAL = 0.05  # 쓰기를 모으는 최대 시간 (초)
+WRITE_BEHIND_MAX_BATCH = 200  # 한 트랜잭션에 묶을 최대 쓰기 수
+
+class WriteBehindQueue:
+    """
+    쓰기를 큐에 넣고 바로 반환한 뒤, 백그라운드 스레드가 여러 쓰기를 한 트랜잭션으로 저장합니다.
+    같은 사용자의 데이터를 읽기 전에 wait_for_user()를 호출하면 자신의 쓰기를 항상 읽을 수 있습니다.
+    """
+
+    def __init__(self, flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL, max_batch: int = WRITE_BEHIND_MAX_BATCH):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.failed_writes = 0
+        self._pending: list[tuple[int, str, int, tuple]] = []  # (순번, 종류, user_id, 인자)
+        self._last_seq_by_user: Dict[int, int] = {}
+        self._queued_seq = 0
+        self._written_seq = 0
+        self._urgent = False
+        self._stopping = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="codedu-write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, user_id: int, args: tuple) -> bool:
+        """
+        쓰기를 큐에 넣습니다. ('solved': 풀이 기록, 'login': 마지막 로그인 시간)
+        Returns: 큐에 넣었는지 여부 - 쓰기 스레드가 멈췄거나 종료 중이면 False이며, 호출자가 바로 저장해야 합니다.
+        """
+        with self._cond:
+            if self._stopping:
+                # 종료 중(stop, disable_write_behind)에는 새 쓰기를 받지 않음 - 남은 쓰기는 스레드가 저장
+                return False
+            if self._thread.is_alive():
+                self._queued_seq += 1
+                self._pending.append((self._queued_seq, kind, user_id, args))
+                self._last_seq_by_user[user_id] = self._queued_seq
+                self._cond.notify_all()
+                return True
+        self._write_orphaned()
+        return False
+
+    def _write_orphaned(self):
+        """쓰기 스레드가 멈췄을 때, 그 전에 받아 둔 쓰기를 호출한 스레드에서 저장합니다."""
+        with self._cond:
+            if self._thread.is_alive() or not self._pending:
+                return
+            batch, self._pending = self._pending, []
+        self._write(batch)
+        with self._cond:
+            self._written_seq = max(self._written_seq, batch[-1][0])
+            self._cond.notify_all()
+
+    def wait_for_user(self, user_id: int):
+        """user_id의 아직 저장되지 않은 쓰기가 모두 저장될 때까지 기다립니다."""
+        self._write_orphaned()
+        with self._cond:
+            target = self._last_seq_by_user.get(user_id, 0)
+            if target <= self._written_seq:
+                return
+            self._urgent = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._written_seq >= target or not self._thread.is_alive())
+
+    def flush(self):
+        """큐에 있는 모든 쓰기가 저장될 때까지 기다립니다."""
+        self._write_orphaned()
+        with self._cond:
+            target = self._queued_seq
+            self._urgent = True
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._written_seq >= target or not self._thread.is_alive())
+
+    def stop(self):
+        """남은 쓰기를 모두 저장하고 스레드를 종료합니다."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._stopping:
+                    self._cond.wait()
+                # 쓰기를 모으기 위해 잠시 기다림 (급한 요청, 가득 찬 배치, 종료 시에는 바로 저장)
+                deadline = time.monotonic() + self.flush_interval
+                while self._pending and not (self._urgent or self._stopping or len(self._pending) >= self.max_batch):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                if not self._pending:
+                    self._urgent = False
+                if not batch and self._stopping:
+                    return
+
+            if batch:
+                try:
+                    self._write(batch)
+                except BaseException:
+                    # 스레드가 멈추면 이 배치를 다시 큐에 넣어 다음 호출자가 저장하게 함 (_write_orphaned)
+                    with self._cond:
+                        self._pending[:0] = batch
+                    raise
+                with self._cond:
+                    self._written_seq = batch[-1][0]
+                    self._cond.notify_all()
+
+    def _write(self, batch: list[tuple[int, str, int, tuple]]):
+        """배치를 한 트랜잭션으로 저장하고, 실패하면 하나씩 다시 저장합니다."""
+        # sqlite3 오류가 아닌 예외(연결 풀 대기 시간 초과 등)로 쓰기 스레드가 멈추지 않도록 모두 잡음
+        try:
+            notifications = self._apply(batch)
+        except Exception:
+            notifications = []
+            for item in batch:
+                try:
+                    notifications.extend(self._apply([item]))
+                except Exception as e:
+                    _record_error("write_behind", e)
+                    self.failed_writes += 1
+        for table, user_id, language in notifications:
+            _notify_write(table, user_id, language)
+
+    def _apply(self, batch: list[tuple[int, str, int, tuple]]) -> list[tuple[str, int, Optional[str]]]:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        notifications = []
+        
+        try:
+            for _, kind, user_id, args in batch:
+                if kind == "solved":
+                    problem_id, problem_title, problem_url, detail_level, language, solved_at = args
+                    previous_language = _save_solved_problem(cursor, user_id, problem_id, problem_title, problem_url,
+                                                             detail_level, language, solved_at)
+                    notifications.append(("solved_problems", user_id, language))
+                    if previous_language is not None and previous_language != language:
+                        notifications.append(("solved_problems", user_id, previous_language))
+                elif kind == "login":
+                    cursor.execute("""
+                        UPDATE users SET last_login = ?
+                        WHERE id = ?
+                    """, (args[0], user_id))
+            conn.commit()
+            return notifications
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+_write_behind: Optional[WriteBehindQueue] = None
+_write_behind_lock = threading.Lock()
+
+def _get_write_behind() -> Optional[WriteBehindQueue]:
+    """쓰기 지연 모드가 켜져 있으면 큐를 반환합니다."""
+    global _write_behind
+    if not WRITE_BEHIND:
+        return None
+    if _write_behind is None:
+        with _write_behind_lock:
+            if _write_behind is None and WRITE_BEHIND:
+                _write_behind = WriteBehindQueue(WRITE_BEHIND_FLUSH_INTERVAL, WRITE_BEHIND_MAX_BATCH)
+                atexit.register(disable_write_behind)  # 종료 시 남은 쓰기 저장
+    return _write_behind
+
+def enable_write_behind(flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL, max_batch: int = WRITE_BEHIND_MAX_BATCH):
+    """쓰기 지연 모드를 켭니다."""
+    global WRITE_BEHIND, WRITE_BEHIND_FLUSH_INTERVAL, WRITE_BEHIND_MAX_BATCH
+    disable_write_behind()
+    WRITE_BEHIND_FLUSH_INTERVAL = flush_interval
+    WRITE_BEHIND_MAX_BATCH = max_batch
+    WRITE_BEHIND = True
+
+def disable_write_behind():
+    """남은 쓰기를 모두 저장하고 쓰기 지연 모드를 끕니다."""
+    global WRITE_BEHIND, _write_behind
+    with _write_behind_lock:
+        WRITE_BEHIND = False
+        queue_, _write_behind = _write_behind, None
+    if queue_ is not None:
+        queue_.stop()
+
+def flush_writes():
+    """쓰기 지연 모드에서 큐에 남은 쓰기를 바로 저장합니다."""
+    if _write_behind is not None:
+        _write_behind.flush()
+
+def _await_pending_writes(user_id: int):
+    """user_id의 지연된 쓰기가 있으면 저장될 때까지 기다립니다. (자신의 쓰기를 읽기 위함)"""
+    if _write_behind is not None:
+        _write_behind.wait_for_user(user_id)
+
+def _utc_timestamp() -> str:
+    """CURRENT_TIMESTAMP와 같은 형식의 현재 시각 (UTC)"""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+def _metric_values() -> list:
+    """metrics 스냅샷에 넣을 오류 수, 연결 풀 대기, 쓰기 지연 큐 상태"""
+    errors = get_error_counts()
+    values = [("db_errors", {"fn": operation}, count) for operation, count in errors['errors'].items()]
+    values.append(("db_lock_timeouts", {}, errors['locked']))
+    if last_init_seconds is not None:
+        values.append(("db_init_seconds", {}, last_init_seconds))
+    pool = _pool
+    if pool is not None:
+        values.append(("db_pool_waits", {}, pool.waits))
+        values.append(("db_pool_wait_seconds", {}, pool.wait_time))
+    write_behind = _write_behind
+    if write_behind is not None:
+        values.append(("db_write_behind_pending", {}, len(write_behind._pending)))
+        values.append(("db_write_behind_failed", {}, write_behind.failed_writes))
+    return values
+
+metrics.register_collector(_metric_values)
+
+def get_db_connection():
+    """데이터베이스 연결을 반환합니다. (close()를 호출하면 풀에 반환됨)"""
+    if _initialized_database != DATABASE_NAME:
+        ensure_database()
+    return get_pool().acquire()
+
+def _add_column_if_missing(cursor: sqlite3.Cursor, table: str, column: str, definition: str):
+    """기존 테이블에 컬럼이 없으면 추가합니다."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    if column not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def _migration_1_base_schema(cursor: sqlite3.Cursor):
+    """기본 테이블을 생성합니다. (이전 버전 DB에는 빠진 컬럼을 추가)"""
     # 사용자 테이블 생성
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -28,14 +556,7 @@ def init_database():
             last_login TIMESTAMP
         )
     """)
-    
-    # 기존 테이블에 learning_language 컬럼 추가 (이미 존재하면 무시)
-    try:
-        cursor.execute("ALTER TABLE users ADD COLUMN learning_language TEXT DEFAULT 'Python'")
-        conn.commit()
-    except sqlite3.OperationalError:
-        # 컬럼이 이미 존재하는 경우 무시
-        pass
+    _add_column_if_missing(cursor, "users", "learning_language", "TEXT DEFAULT 'Python'")
     
     # 학습 상태 테이블 생성
     cursor.execute("""
@@ -51,14 +572,7 @@ def init_database():
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
         )
     """)
-    
-    # 기존 테이블에 language 컬럼 추가 (이미 존재하면 무시)
-    try:
-        cursor.execute("ALTER TABLE learning_progress ADD COLUMN language TEXT DEFAULT 'Python'")
-        conn.commit()
-    except sqlite3.OperationalError:
-        # 컬럼이 이미 존재하는 경우 무시
-        pass
+    _add_column_if_missing(cursor, "learning_progress", "language", "TEXT DEFAULT 'Python'")
     
     # 문제 풀이 기록 테이블 생성
     cursor.execute("""
@@ -75,19 +589,197 @@ def init_database():
             UNIQUE(user_id, problem_id, detail_level)
         )
     """)
+
+def _migration_2_access_indexes(cursor: sqlite3.Cursor):
+    """
+    사용자/언어/난이도별 조회를 위한 인덱스를 추가합니다.
+    get_user_stats의 learning_progress 집계와 언어를 지정한 get_solved_problem_ids는 인덱스만 읽습니다. (커버링)
+    """
+    # get_user_stats(_progress_aggregates)는 인덱스만 읽음
+    # get_learning_progress, get_user_detail_level은 (user_id, language)로 행을 찾는 데만 쓰고
+    # chapter, last_accessed, detailLevel은 테이블에서 읽음
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_learning_progress_user_language
+        ON learning_progress (user_id, language, completed, score)
+    """)
+    # 언어를 지정한 get_solved_problems_count, get_level_problems_count,
+    # get_solved_problem_ids, is_problem_solved
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_solved_problems_user_language_level
+        ON solved_problems (user_id, language, detail_level, problem_id)
+    """)
+    # 언어를 지정하지 않은 경우
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_solved_problems_user_level
+        ON solved_problems (user_id, detail_level, problem_id)
+    """)
+    # get_solved_problems (최근 순 정렬)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_solved_problems_user_solved_at
+        ON solved_problems (user_id, solved_at)
+    """)
+
+def _rebuild_solved_counters(cursor: sqlite3.Cursor, user_id: Optional[int] = None):
+    """solved_problems에서 풀이 수 카운터를 다시 계산합니다. (user_id가 없으면 전체)"""
+    user_filter = "" if user_id is None else " AND user_id = ?"
+    params = () if user_id is None else (user_id,)
+    
+    cursor.execute(f"DELETE FROM solved_counters WHERE 1 = 1{user_filter}", params)
+    cursor.execute(f"""
+        INSERT INTO solved_counters (user_id, language, detail_level, solved_count)
+        SELECT user_id, language, detail_level, COUNT(*)
+        FROM solved_problems
+        WHERE language IS NOT NULL{user_filter}
+        GROUP BY user_id, language, detail_level
+    """, params)
     
-    conn.commit()
-    conn.close()
+    cursor.execute(f"DELETE FROM solved_level_counters WHERE 1 = 1{user_filter}", params)
+    for level, (low, high) in LEVEL_DETAIL_RANGES.items():
+        cursor.execute(f"""
+            INSERT INTO solved_level_counters (user_id, language, level, problem_count)
+            SELECT user_id, language, ?, COUNT(DISTINCT problem_id)
+            FROM solved_problems
+            WHERE language IS NOT NULL AND detail_level BETWEEN ? AND ?{user_filter}
+            GROUP BY user_id, language
+        """, (level, low, high) + params)
+
+def _migration_3_solved_counters(cursor: sqlite3.Cursor):
+    """풀이 수 카운터 테이블을 만들고 기존 기록으로 채웁니다."""
+    # 사용자/언어/난이도별 풀었던 문제 수 (get_solved_problems_count)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS solved_counters (
+            user_id INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            detail_level INTEGER NOT NULL,
+            solved_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, language, detail_level)
+        ) WITHOUT ROWID
+    """)
+    # 사용자/언어/학습 수준별 풀었던 서로 다른 문제 수 (get_level_problems_count)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS solved_level_counters (
+            user_id INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            level TEXT NOT NULL,
+            problem_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, language, level)
+        ) WITHOUT ROWID
+    """)
+    _rebuild_solved_counters(cursor)
+
+def _migration_4_review_sets(cursor: sqlite3.Cursor):
+    """사용자/언어/난이도/날짜별 복습 문제 세트 테이블을 만듭니다."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS review_sets (
+            user_id INTEGER NOT NULL,
+            language TEXT NOT NULL,
+            detail_level INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            problems TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, language, detail_level, day),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+    """)
+
+def _migration_5_history_indexes(cursor: sqlite3.Cursor):
+    """언어별 풀이 기록을 최근 순으로 나눠 읽기 위한 인덱스를 추가합니다."""
+    # get_solved_history, iter_solved_problems (언어 지정)
+    # 보조 인덱스 끝에는 rowid(id)가 붙으므로 (solved_at, id) 커서를 인덱스만으로 이어서 읽을 수 있음
+    # 언어를 지정하지 않은 경우는 idx_solved_problems_user_solved_at 사용
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_solved_problems_user_language_solved_at
+        ON solved_problems (user_id, language, solved_at)
+    """)
+
+# (버전, 설명, 적용 함수) - 새 마이그레이션은 항상 끝에 추가
+MIGRATIONS = [
+    (1, "기본 테이블 생성", _migration_1_base_schema),
+    (2, "조회용 인덱스 추가", _migration_2_access_indexes),
+    (3, "풀이 수 카운터 추가", _migration_3_solved_counters),
+    (4, "복습 문제 세트 추가", _migration_4_review_sets),
+    (5, "풀이 기록 조회용 인덱스 추가", _migration_5_history_indexes),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """DB에 기록된 스키마 버전을 반환합니다. (PRAGMA user_version)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    """
+    아직 적용되지 않은 마이그레이션을 순서대로 한 트랜잭션 안에서 적용합니다.
+    쓰기 잠금을 잡은 뒤 버전을 다시 확인하므로 여러 프로세스가 동시에 실행해도 한 번만 적용됩니다.
+    Returns: 적용한 버전 목록
+    """
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return []
+
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        current = get_schema_version(conn)
+        applied = []
+        for version, description, apply in MIGRATIONS:
+            if version <= current:
+                continue
+            apply(cursor)
+            cursor.execute(f"PRAGMA user_version = {version}")
+            applied.append(version)
+        conn.commit()
+        return applied
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+# 스키마를 확인한 DB 경로 (모듈을 불러올 때가 아니라 처음 연결할 때 한 번만 확인)
+_initialized_database: Optional[str] = None
+_init_lock = threading.RLock()
+last_init_seconds: Optional[float] = None  # 마지막 초기화에 걸린 시간 (초)
+
+@metrics.timed("db.init_database")
+def init_database() -> list[int]:
+    """
+    데이터베이스 스키마를 최신 버전으로 맞춥니다.
+    스키마가 이미 최신이면 user_version만 읽고 끝나며, 여러 프로세스가 동시에 실행해도
+    migrate()가 쓰기 잠금 안에서 버전을 다시 확인하므로 한 번만 적용됩니다.
+    Returns: 적용한 마이그레이션 버전 목록
+    """
+    global _initialized_database, last_init_seconds
+    with _init_lock:
+        database = DATABASE_NAME
+        started = time.perf_counter()
+        conn = get_pool().acquire()
+        
+        try:
+            applied = migrate(conn)
+        finally:
+            conn.close()
+        last_init_seconds = time.perf_counter() - started
+        _initialized_database = database
+        return applied
+
+def ensure_database():
+    """현재 DATABASE_NAME의 스키마를 아직 확인하지 않았으면 init_database()를 실행합니다."""
+    if _initialized_database == DATABASE_NAME:
+        return
+    with _init_lock:
+        if _initialized_database == DATABASE_NAME:
+            return
+        init_database()
 
 def hash_password(password: str) -> str:
-    """비밀번호를 해시화합니다."""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """비밀번호를 해시화합니다. (솔트를 붙인 PBKDF2/scrypt, passwords 모듈 참고)"""
+    return passwords.hash_password(password)
 
+@metrics.timed("db.register_user")
 def register_user(username: str, password: str, level: str = "초급") -> tuple[bool, str]:
     """
     새 사용자를 등록합니다.
     Returns: (성공 여부, 메시지)
     """
+    # 해시 계산은 느리므로 연결을 빌리기 전에 함
+    password_hash = hash_password(password)
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -98,7 +790,6 @@ def register_user(username: str, password: str, level: str = "초급") -> tuple[
             return False, "이미 존재하는 아이디입니다."
         
         # 사용자 추가
-        password_hash = hash_password(password)
         cursor.execute("""
             INSERT INTO users (username, password_hash, level)
             VALUES (?, ?, ?)
@@ -108,51 +799,78 @@ def register_user(username: str, password: str, level: str = "초급") -> tuple[
         return True, "회원가입이 완료되었습니다."
     
     except sqlite3.Error as e:
+        _record_error("register_user", e)
         return False, f"데이터베이스 오류: {str(e)}"
     finally:
         conn.close()
 
+@metrics.timed("db.verify_user")
 def verify_user(username: str, password: str) -> tuple[bool, Optional[Dict[str, Any]]]:
     """
     사용자 로그인을 확인합니다.
+    비밀번호는 연결을 풀에 돌려준 뒤 확인하고, 예전 형식이나 비용이 다른 해시이면 새로 해시해 저장합니다.
     Returns: (성공 여부, 사용자 정보 딕셔너리 또는 None)
     """
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        password_hash = hash_password(password)
         cursor.execute("""
-            SELECT id, username, level, learning_language, created_at
+            SELECT id, username, password_hash, level, learning_language, created_at
             FROM users
-            WHERE username = ? AND password_hash = ?
-        """, (username, password_hash))
+            WHERE username = ?
+        """, (username,))
         
         user = cursor.fetchone()
+    except sqlite3.Error as e:
+        _record_error("verify_user", e)
+        return False, None
+    finally:
+        conn.close()
+    
+    # 해시 확인은 수백 ms가 걸리므로 연결을 잡고 있지 않음
+    if not passwords.verify_password(password, user['password_hash'] if user else None):
+        return False, None
+    
+    new_hash = None
+    if passwords.needs_rehash(user['password_hash']):
+        new_hash = passwords.hash_password(password)
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        if new_hash is not None:
+            # 그사이 다른 로그인이 먼저 바꿨으면 그대로 둠
+            cursor.execute("""
+                UPDATE users SET password_hash = ?
+                WHERE id = ? AND password_hash = ?
+            """, (new_hash, user['id'], user['password_hash']))
         
-        if user:
-            # 마지막 로그인 시간 업데이트
+        # 마지막 로그인 시간 업데이트
+        write_behind = _get_write_behind()
+        if write_behind is None or not write_behind.submit("login", user['id'], (_utc_timestamp(),)):
             cursor.execute("""
                 UPDATE users SET last_login = CURRENT_TIMESTAMP
                 WHERE id = ?
             """, (user['id'],))
-            conn.commit()
-            
-            return True, {
-                'id': user['id'],
-                'username': user['username'],
-                'level': user['level'],
-                'learning_language': user['learning_language'] or 'Python',
-                'created_at': user['created_at']
-            }
-        else:
-            return False, None
+        conn.commit()
+        
+        return True, {
+            'id': user['id'],
+            'username': user['username'],
+            'level': user['level'],
+            'learning_language': user['learning_language'] or 'Python',
+            'created_at': user['created_at']
+        }
     
     except sqlite3.Error as e:
+        _record_error("verify_user", e)
         return False, None
     finally:
         conn.close()
 
+@metrics.timed("db.update_user_level")
 def update_user_level(user_id: int, level: str) -> bool:
     """사용자의 학습 수준을 업데이트합니다."""
     conn = get_db_connection()
@@ -164,12 +882,15 @@ def update_user_level(user_id: int, level: str) -> bool:
             WHERE id = ?
         """, (level, user_id))
         conn.commit()
+        _notify_write("users", user_id)
         return True
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("update_user_level", e)
         return False
     finally:
         conn.close()
 
+@metrics.timed("db.update_user_language")
 def update_user_language(user_id: int, language: str) -> bool:
     """사용자의 학습 언어를 업데이트합니다."""
     conn = get_db_connection()
@@ -181,12 +902,15 @@ def update_user_language(user_id: int, language: str) -> bool:
             WHERE id = ?
         """, (language, user_id))
         conn.commit()
+        _notify_write("users", user_id)
         return True
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("update_user_language", e)
         return False
     finally:
         conn.close()
 
+@metrics.timed("db.get_user_language")
 def get_user_language(user_id: int) -> Optional[str]:
     """사용자의 학습 언어를 조회합니다."""
     conn = get_db_connection()
@@ -198,11 +922,13 @@ def get_user_language(user_id: int) -> Optional[str]:
         """, (user_id,))
         result = cursor.fetchone()
         return result['learning_language'] if result and result['learning_language'] else 'Python'
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("get_user_language", e)
         return 'Python'
     finally:
         conn.close()
 
+@metrics.timed("db.save_learning_progress")
 def save_learning_progress(user_id: int, chapter: str, language: str, completed: bool = False, score: int = 0) -> bool:
     """학습 진행 상태를 저장합니다. (언어별로 관리)"""
     conn = get_db_connection()
@@ -232,12 +958,15 @@ def save_learning_progress(user_id: int, chapter: str, language: str, completed:
             """, (user_id, language, chapter, completed, score))
         
         conn.commit()
+        _notify_write("learning_progress", user_id, language)
         return True
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("save_learning_progress", e)
         return False
     finally:
         conn.close()
 
+@metrics.timed("db.get_learning_progress", rows=True)
 def get_learning_progress(user_id: int, language: Optional[str] = None) -> list[Dict[str, Any]]:
     """사용자의 학습 진행 상태를 조회합니다. (언어별 필터링 가능)"""
     conn = get_db_connection()
@@ -261,11 +990,13 @@ def get_learning_progress(user_id: int, language: Optional[str] = None) -> list[
         
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("get_learning_progress", e)
         return []
     finally:
         conn.close()
 
+@metrics.timed("db.get_user_detail_level")
 def get_user_detail_level(user_id: int, language: str = 'Python') -> int:
     """사용자의 detailLevel을 조회합니다."""
     conn = get_db_connection()
@@ -279,11 +1010,13 @@ def get_user_detail_level(user_id: int, language: str = 'Python') -> int:
         """, (user_id, language))
         result = cursor.fetchone()
         return result['detailLevel'] if result and result['detailLevel'] else 1
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("get_user_detail_level", e)
         return 1
     finally:
         conn.close()
 
+@metrics.timed("db.update_user_detail_level")
 def update_user_detail_level(user_id: int, detail_level: int, language: str = 'Python') -> bool:
     """사용자의 detailLevel을 업데이트합니다."""
     conn = get_db_connection()
@@ -314,69 +1047,47 @@ def update_user_detail_level(user_id: int, detail_level: int, language: str = 'P
             """, (user_id, language, detail_level))
         
         conn.commit()
+        _notify_write("learning_progress", user_id, language)
         return True
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("update_user_detail_level", e)
         return False
     finally:
         conn.close()
 
+def _progress_aggregates(cursor: sqlite3.Cursor, user_id: int, language: Optional[str]) -> Dict[str, Any]:
+    """learning_progress를 한 번 훑어서 완료 수, 전체 수, 평균 점수를 계산합니다."""
+    query = """
+        SELECT COALESCE(SUM(completed = 1), 0) as completed_count,
+               COUNT(*) as total_count,
+               AVG(score) as avg_score
+        FROM learning_progress
+        WHERE user_id = ?
+    """
+    params = [user_id]
+    
+    if language:
+        query += " AND language = ?"
+        params.append(language)
+    
+    cursor.execute(query, tuple(params))
+    row = cursor.fetchone()
+    return {
+        'completed_chapters': row['completed_count'],
+        'total_chapters': row['total_count'],
+        'average_score': round(row['avg_score'] or 0, 2)
+    }
+
+@metrics.timed("db.get_user_stats")
 def get_user_stats(user_id: int, language: Optional[str] = None) -> Dict[str, Any]:
     """사용자의 통계 정보를 반환합니다. (언어별 필터링 가능)"""
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        if language:
-            # 특정 언어의 통계
-            cursor.execute("""
-                SELECT COUNT(*) as completed_count
-                FROM learning_progress
-                WHERE user_id = ? AND language = ? AND completed = 1
-            """, (user_id, language))
-            completed = cursor.fetchone()['completed_count']
-            
-            cursor.execute("""
-                SELECT COUNT(*) as total_count
-                FROM learning_progress
-                WHERE user_id = ? AND language = ?
-            """, (user_id, language))
-            total = cursor.fetchone()['total_count']
-            
-            cursor.execute("""
-                SELECT AVG(score) as avg_score
-                FROM learning_progress
-                WHERE user_id = ? AND language = ?
-            """, (user_id, language))
-            avg_score = cursor.fetchone()['avg_score'] or 0
-        else:
-            # 전체 통계
-            cursor.execute("""
-                SELECT COUNT(*) as completed_count
-                FROM learning_progress
-                WHERE user_id = ? AND completed = 1
-            """, (user_id,))
-            completed = cursor.fetchone()['completed_count']
-            
-            cursor.execute("""
-                SELECT COUNT(*) as total_count
-                FROM learning_progress
-                WHERE user_id = ?
-            """, (user_id,))
-            total = cursor.fetchone()['total_count']
-            
-            cursor.execute("""
-                SELECT AVG(score) as avg_score
-                FROM learning_progress
-                WHERE user_id = ?
-            """, (user_id,))
-            avg_score = cursor.fetchone()['avg_score'] or 0
-        
-        return {
-            'completed_chapters': completed,
-            'total_chapters': total,
-            'average_score': round(avg_score, 2)
-        }
-    except sqlite3.Error:
+        return _progress_aggregates(cursor, user_id, language)
+    except sqlite3.Error as e:
+        _record_error("get_user_stats", e)
         return {
             'completed_chapters': 0,
             'total_chapters': 0,
@@ -385,77 +1096,238 @@ def get_user_stats(user_id: int, language: Optional[str] = None) -> Dict[str, An
     finally:
         conn.close()
 
+@metrics.timed("db.get_dashboard_stats")
+def get_dashboard_stats(user_id: int, language: Optional[str] = None) -> Dict[str, Any]:
+    """
+    대시보드와 학습 화면에 필요한 통계를 한 번에 반환합니다. (언어별 필터링 가능)
+    Returns: get_user_stats의 항목 +
+        'solved_by_detail_level': {난이도: 풀었던 문제 수},
+        'solved_by_level': {'초급'/'중급'/'고급': 풀었던 서로 다른 문제 수}
+    """
+    _await_pending_writes(user_id)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    stats = {
+        'completed_chapters': 0,
+        'total_chapters': 0,
+        'average_score': 0,
+        'solved_by_detail_level': {},
+        'solved_by_level': {level: 0 for level in LEVEL_DETAIL_RANGES}
+    }
+    
+    try:
+        stats.update(_progress_aggregates(cursor, user_id, language))
+        
+        params = [user_id]
+        if language:
+            params.append(language)
+        language_filter = " AND language = ?" if language else ""
+        
+        cursor.execute(f"""
+            SELECT detail_level, SUM(solved_count) as count
+            FROM solved_counters
+            WHERE user_id = ?{language_filter}
+            GROUP BY detail_level
+        """, tuple(params))
+        for row in cursor.fetchall():
+            if row['count']:
+                stats['solved_by_detail_level'][row['detail_level']] = row['count']
+        
+        if language:
+            cursor.execute("""
+                SELECT level, problem_count as count
+                FROM solved_level_counters
+                WHERE user_id = ? AND language = ?
+            """, tuple(params))
+        else:
+            # 언어가 달라도 같은 문제는 한 번만 세야 하므로 기록에서 직접 계산
+            band = " ".join(
+                f"WHEN detail_level BETWEEN {low} AND {high} THEN '{level}'"
+                for level, (low, high) in LEVEL_DETAIL_RANGES.items()
+            )
+            cursor.execute(f"""
+                SELECT CASE {band} END as level, COUNT(DISTINCT problem_id) as count
+                FROM solved_problems
+                WHERE user_id = ?
+                GROUP BY level
+            """, tuple(params))
+        for row in cursor.fetchall():
+            if row['level'] is not None:
+                stats['solved_by_level'][row['level']] = row['count']
+        return stats
+    except sqlite3.Error as e:
+        _record_error("get_dashboard_stats", e)
+        return stats
+    finally:
+        conn.close()
+
+def _level_for_detail_level(detail_level: int) -> Optional[str]:
+    """detail_level이 속한 학습 수준(초급/중급/고급)을 반환합니다."""
+    for level, (low, high) in LEVEL_DETAIL_RANGES.items():
+        if low <= detail_level <= high:
+            return level
+    return None
+
+def _bump_solved_counters(cursor: sqlite3.Cursor, user_id: int, problem_id: int, detail_level: int, language: str, delta: int):
+    """
+    한 문제가 (language, detail_level)에 추가(+1)되거나 빠질(-1) 때 카운터를 조정합니다.
+    solved_problems를 변경하기 전에 호출해야 합니다.
+    """
+    cursor.execute("""
+        INSERT INTO solved_counters (user_id, language, detail_level, solved_count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, language, detail_level)
+        DO UPDATE SET solved_count = solved_count + excluded.solved_count
+    """, (user_id, language, detail_level, delta))
+    
+    level = _level_for_detail_level(detail_level)
+    if level is None:
+        return
+    
+    # 같은 학습 수준의 다른 난이도에서 이미 푼 문제면 서로 다른 문제 수는 그대로
+    low, high = LEVEL_DETAIL_RANGES[level]
+    cursor.execute("""
+        SELECT 1 FROM solved_problems
+        WHERE user_id = ? AND problem_id = ? AND detail_level BETWEEN ? AND ?
+        AND detail_level != ? AND language = ?
+        LIMIT 1
+    """, (user_id, problem_id, low, high, detail_level, language))
+    if cursor.fetchone():
+        return
+    
+    cursor.execute("""
+        INSERT INTO solved_level_counters (user_id, language, level, problem_count)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (user_id, language, level)
+        DO UPDATE SET problem_count = problem_count + excluded.problem_count
+    """, (user_id, language, level, delta))
+
+def _save_solved_problem(cursor: sqlite3.Cursor, user_id: int, problem_id: int, problem_title: str, problem_url: str, detail_level: int, language: str, solved_at: Optional[str] = None):
+    """
+    풀이 기록을 저장하고 카운터를 같은 트랜잭션 안에서 갱신합니다. (커밋은 호출자가 함)
+    Returns: 같은 기록이 이전에 저장된 언어 (처음 저장이면 None)
+    """
+    cursor.execute("""
+        SELECT language FROM solved_problems
+        WHERE user_id = ? AND problem_id = ? AND detail_level = ?
+    """, (user_id, problem_id, detail_level))
+    previous = cursor.fetchone()
+    previous_language = previous['language'] if previous else None
+    
+    if previous is None or previous_language != language:
+        _bump_solved_counters(cursor, user_id, problem_id, detail_level, language, 1)
+        if previous_language is not None:
+            _bump_solved_counters(cursor, user_id, problem_id, detail_level, previous_language, -1)
+    
+    # 중복 체크 후 저장 (같은 문제를 같은 레벨에서 다시 풀면 업데이트)
+    cursor.execute("""
+        INSERT OR REPLACE INTO solved_problems 
+        (user_id, problem_id, problem_title, problem_url, detail_level, language, solved_at)
+        VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    """, (user_id, problem_id, problem_title, problem_url, detail_level, language, solved_at))
+    return previous_language
+
+@metrics.timed("db.save_solved_problem")
 def save_solved_problem(user_id: int, problem_id: int, problem_title: str, problem_url: str, detail_level: int, language: str = 'Python') -> bool:
     """문제 풀이 기록을 저장합니다. (중복 방지)"""
+    write_behind = _get_write_behind()
+    if write_behind is not None:
+        if write_behind.submit("solved", user_id, (problem_id, problem_title, problem_url, detail_level, language, _utc_timestamp())):
+            _notify_write("solved_problems", user_id, language)
+            return True
+        # 쓰기 스레드가 멈췄거나 종료 중이면 아래에서 바로 저장
+
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # 중복 체크 후 저장 (같은 문제를 같은 레벨에서 다시 풀면 업데이트)
-        cursor.execute("""
-            INSERT OR REPLACE INTO solved_problems 
-            (user_id, problem_id, problem_title, problem_url, detail_level, language, solved_at)
-            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (user_id, problem_id, problem_title, problem_url, detail_level, language))
-        
+        previous_language = _save_solved_problem(cursor, user_id, problem_id, problem_title, problem_url, detail_level, language)
         conn.commit()
+        _notify_write("solved_problems", user_id, language)
+        if previous_language is not None and previous_language != language:
+            _notify_write("solved_problems", user_id, previous_language)
         return True
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("save_solved_problem", e)
+        return False
+    finally:
+        conn.close()
+
+@metrics.timed("db.rebuild_solved_counters")
+def rebuild_solved_counters(user_id: Optional[int] = None) -> bool:
+    """풀이 수 카운터를 solved_problems에서 다시 계산합니다. (user_id가 없으면 전체)"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        _rebuild_solved_counters(cursor, user_id)
+        conn.commit()
+        _notify_write("solved_problems", user_id)
+        return True
+    except sqlite3.Error as e:
+        _record_error("rebuild_solved_counters", e)
         return False
     finally:
         conn.close()
 
+def rebuild_solved_counters_in(cursor: sqlite3.Cursor, user_id: Optional[int] = None):
+    """
+    rebuild_solved_counters()와 같지만 호출한 쪽의 커서(트랜잭션)에서 계산합니다.
+    커밋과 쓰기 알림은 호출한 쪽에서 합니다. (일괄 가져오기용)
+    """
+    _rebuild_solved_counters(cursor, user_id)
+
+@metrics.timed("db.get_solved_problems_count")
 def get_solved_problems_count(user_id: int, detail_level: int, language: Optional[str] = None) -> int:
     """특정 레벨에서 풀었던 문제 수를 반환합니다."""
+    _await_pending_writes(user_id)
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
         if language:
             cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM solved_problems
-                WHERE user_id = ? AND detail_level = ? AND language = ?
-            """, (user_id, detail_level, language))
+                SELECT solved_count as count
+                FROM solved_counters
+                WHERE user_id = ? AND language = ? AND detail_level = ?
+            """, (user_id, language, detail_level))
         else:
+            # (user_id, problem_id, detail_level)은 유일하므로 언어별 카운터를 합산
             cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM solved_problems
+                SELECT SUM(solved_count) as count
+                FROM solved_counters
                 WHERE user_id = ? AND detail_level = ?
             """, (user_id, detail_level))
         
         result = cursor.fetchone()
-        return result['count'] if result else 0
-    except sqlite3.Error:
+        return (result['count'] or 0) if result else 0
+    except sqlite3.Error as e:
+        _record_error("get_solved_problems_count", e)
         return 0
     finally:
         conn.close()
 
+@metrics.timed("db.get_level_problems_count")
 def get_level_problems_count(user_id: int, level: str, language: Optional[str] = None) -> int:
     """특정 레벨(초급/중급/고급)에서 풀었던 문제 수를 반환합니다."""
+    _await_pending_writes(user_id)
     conn = get_db_connection()
     cursor = conn.cursor()
     
     try:
-        # 레벨에 따라 detail_level 범위 결정
-        if level == "초급":
-            detail_level_range = (1, 10)
-        elif level == "중급":
-            detail_level_range = (11, 20)
-        elif level == "고급":
-            detail_level_range = (21, 30)
-        else:
-            detail_level_range = (1, 10)  # 기본값
+        if level not in LEVEL_DETAIL_RANGES:
+            level = "초급"  # 기본값
         
         if language:
             cursor.execute("""
-                SELECT COUNT(DISTINCT problem_id) as count
-                FROM solved_problems
-                WHERE user_id = ? 
-                AND detail_level >= ? AND detail_level <= ?
-                AND language = ?
-            """, (user_id, detail_level_range[0], detail_level_range[1], language))
+                SELECT problem_count as count
+                FROM solved_level_counters
+                WHERE user_id = ? AND language = ? AND level = ?
+            """, (user_id, language, level))
         else:
+            # 언어가 달라도 같은 문제는 한 번만 세야 하므로 기록에서 직접 계산
+            detail_level_range = LEVEL_DETAIL_RANGES[level]
             cursor.execute("""
                 SELECT COUNT(DISTINCT problem_id) as count
                 FROM solved_problems
@@ -465,13 +1337,16 @@ def get_level_problems_count(user_id: int, level: str, language: Optional[str] =
         
         result = cursor.fetchone()
         return result['count'] if result else 0
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("get_level_problems_count", e)
         return 0
     finally:
         conn.close()
 
+@metrics.timed("db.get_solved_problems", rows=True)
 def get_solved_problems(user_id: int, detail_level: Optional[int] = None, language: Optional[str] = None) -> list[Dict[str, Any]]:
     """풀었던 문제 목록을 조회합니다."""
+    _await_pending_writes(user_id)
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -492,13 +1367,116 @@ def get_solved_problems(user_id: int, detail_level: Optional[int] = None, langua
         cursor.execute(query, tuple(params))
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("get_solved_problems", e)
         return []
     finally:
         conn.close()
 
+def _history_timestamp(value) -> Optional[str]:
+    """날짜 범위 값을 solved_at과 비교할 수 있는 'YYYY-MM-DD HH:MM:SS' 형식 문자열로 바꿉니다."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)  # solved_at은 UTC로 저장됨
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value.strftime("%Y-%m-%d")  # date
+
+def _solved_history_page(cursor: sqlite3.Cursor, user_id: int, limit: int, after: Optional[tuple[str, int]],
+                         detail_level: Optional[int], language: Optional[str],
+                         since: Optional[str], until: Optional[str]) -> list[sqlite3.Row]:
+    """(solved_at, id) 내림차순으로 after 다음부터 limit개의 풀이 기록을 읽습니다."""
+    query = """
+        SELECT id, problem_id, problem_title, problem_url, detail_level, language, solved_at
+        FROM solved_problems WHERE user_id = ?
+    """
+    params = [user_id]
+    
+    if language:
+        query += " AND language = ?"
+        params.append(language)
+    
+    if detail_level is not None:
+        query += " AND detail_level = ?"
+        params.append(detail_level)
+    
+    if since is not None:
+        query += " AND solved_at >= ?"
+        params.append(since)
+    
+    if until is not None:
+        query += " AND solved_at < ?"
+        params.append(until)
+    
+    if after is not None:
+        # OFFSET과 달리 앞 페이지를 건너뛰며 읽지 않고 인덱스에서 바로 이어서 읽음
+        query += " AND (solved_at, id) < (?, ?)"
+        params.extend(after)
+    
+    query += " ORDER BY solved_at DESC, id DESC LIMIT ?"
+    params.append(limit)
+    
+    cursor.execute(query, tuple(params))
+    return cursor.fetchall()
+
+def _read_solved_history(user_id: int, limit: int, after: Optional[tuple[str, int]],
+                         detail_level: Optional[int], language: Optional[str],
+                         since, until) -> tuple[list[Dict[str, Any]], Optional[tuple[str, int]]]:
+    """get_solved_history()와 같지만 sqlite3 오류를 그대로 발생시킵니다."""
+    _await_pending_writes(user_id)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        # 다음 페이지가 있는지 알기 위해 하나 더 읽음
+        rows = _solved_history_page(cursor, user_id, limit + 1, tuple(after) if after else None,
+                                    detail_level, language, _history_timestamp(since), _history_timestamp(until))
+        page = [dict(row) for row in rows[:limit]]
+        next_cursor = (page[-1]['solved_at'], page[-1]['id']) if len(rows) > limit else None
+        return page, next_cursor
+    finally:
+        conn.close()
+
+@metrics.timed("db.get_solved_history", rows=True)
+def get_solved_history(user_id: int, limit: int = HISTORY_PAGE_SIZE, after: Optional[tuple[str, int]] = None,
+                       detail_level: Optional[int] = None, language: Optional[str] = None,
+                       since=None, until=None) -> tuple[list[Dict[str, Any]], Optional[tuple[str, int]]]:
+    """
+    풀었던 문제 목록을 최근 순으로 한 페이지씩 조회합니다.
+    after에 이전 페이지가 돌려준 다음 커서를 넘기면 그 다음 페이지를 읽습니다.
+    since 이상, until 미만의 기록만 읽으며 날짜는 문자열, date, datetime 모두 받습니다. (UTC 기준)
+    Returns: (기록 목록, 다음 페이지 커서 - 마지막 페이지이면 None)
+    """
+    try:
+        return _read_solved_history(user_id, limit, after, detail_level, language, since, until)
+    except sqlite3.Error as e:
+        _record_error("get_solved_history", e)
+        return [], None
+
+def iter_solved_problems(user_id: int, detail_level: Optional[int] = None, language: Optional[str] = None,
+                         since=None, until=None, batch_size: int = HISTORY_BATCH_SIZE):
+    """
+    풀었던 문제를 최근 순으로 하나씩 돌려주는 제너레이터입니다. (내보내기용)
+    batch_size개씩 나눠 읽고 배치마다 연결을 풀에 돌려주므로, 전체 목록을 메모리에 올리지 않고
+    소비하는 쪽이 느려도 연결을 붙잡고 있지 않습니다.
+    중간에 조회가 실패하면 잘린 결과가 완전한 것처럼 보이지 않도록 sqlite3.Error를 그대로 발생시킵니다.
+    """
+    after = None
+    while True:
+        try:
+            page, after = _read_solved_history(user_id, batch_size, after, detail_level, language, since, until)
+        except sqlite3.Error as e:
+            _record_error("iter_solved_problems", e)
+            raise
+        yield from page
+        if after is None:
+            return
+
+@metrics.timed("db.is_problem_solved")
 def is_problem_solved(user_id: int, problem_id: int, detail_level: int, language: Optional[str] = None) -> bool:
     """특정 문제가 해결되었는지 확인합니다."""
+    _await_pending_writes(user_id)
     conn = get_db_connection()
     cursor = conn.cursor()
     
@@ -518,11 +1496,90 @@ def is_problem_solved(user_id: int, problem_id: int, detail_level: int, language
         
         result = cursor.fetchone()
         return result['count'] > 0 if result else False
-    except sqlite3.Error:
+    except sqlite3.Error as e:
+        _record_error("is_problem_solved", e)
         return False
     finally:
         conn.close()
 
-# 데이터베이스 초기화 (모듈이 로드될 때 실행)
-init_database()
+@metrics.timed("db.get_solved_problem_ids", rows=True)
+def get_solved_problem_ids(user_id: int, problem_ids: list[int], detail_level: int, language: Optional[str] = None) -> set[int]:
+    """주어진 문제들 중 해결된 문제의 ID 집합을 한 번의 쿼리로 반환합니다."""
+    if not problem_ids:
+        return set()
 
+    _await_pending_writes(user_id)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        placeholders = ", ".join("?" for _ in problem_ids)
+        query = f"""
+            SELECT DISTINCT problem_id
+            FROM solved_problems
+            WHERE user_id = ? AND detail_level = ? AND problem_id IN ({placeholders})
+        """
+        params = [user_id, detail_level, *problem_ids]
+        
+        if language:
+            query += " AND language = ?"
+            params.append(language)
+        
+        cursor.execute(query, tuple(params))
+        return {row['problem_id'] for row in cursor.fetchall()}
+    except sqlite3.Error as e:
+        _record_error("get_solved_problem_ids", e)
+        return set()
+    finally:
+        conn.close()
+
+@metrics.timed("db.get_review_set")
+def get_review_set(user_id: int, language: str, detail_level: int, day: str) -> Optional[list[tuple[int, str, str]]]:
+    """저장된 복습 문제 세트를 반환합니다. 없으면 None을 반환합니다."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT problems FROM review_sets
+            WHERE user_id = ? AND language = ? AND detail_level = ? AND day = ?
+        """, (user_id, language, detail_level, day))
+        result = cursor.fetchone()
+        return [tuple(p) for p in json.loads(result['problems'])] if result else None
+    except (sqlite3.Error, ValueError) as e:
+        _record_error("get_review_set", e)
+        return None
+    finally:
+        conn.close()
+
+@metrics.timed("db.save_review_set")
+def save_review_set(user_id: int, language: str, detail_level: int, day: str, problems: list[tuple[int, str, str]]) -> list[tuple[int, str, str]]:
+    """
+    복습 문제 세트를 저장하고 이전 날짜의 세트는 지웁니다.
+    같은 날 이미 저장된 세트가 있으면 그 세트를 유지합니다.
+    Returns: 저장된 세트
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("""
+            INSERT OR IGNORE INTO review_sets (user_id, language, detail_level, day, problems)
+            VALUES (?, ?, ?, ?, ?)
+        """, (user_id, language, detail_level, day, json.dumps(problems, ensure_ascii=False)))
+        cursor.execute("""
+            DELETE FROM review_sets
+            WHERE user_id = ? AND language = ? AND day < ?
+        """, (user_id, language, day))
+        cursor.execute("""
+            SELECT problems FROM review_sets
+            WHERE user_id = ? AND language = ? AND detail_level = ? AND day = ?
+        """, (user_id, language, detail_level, day))
+        result = cursor.fetchone()
+        conn.commit()
+        return [tuple(p) for p in json.loads(result['problems'])] if result else problems
+    except (sqlite3.Error, ValueError) as e:
+        _record_error("save_review_set", e)
+        return problems
+    finally:
+        conn.close()
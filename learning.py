@@ -0,0 +1,103 @@
+"""
+학습 화면의 진행 규칙입니다. (난이도 레벨업, 레벨 승급, 다음 난이도 문제 목록 미리 받기, 문제 목록 조회)
+
+streamlit_app.show_learning과 loadtest.py가 같은 규칙을 쓰도록 Streamlit 없이 동작하는 함수로 둡니다.
+user_info는 st.session_state.user_info와 같은 딕셔너리이며, 바뀐 레벨은 여기에 바로 반영됩니다.
+"""
+from typing import Optional, Dict, Any
+
+import async_database
+import data_cache
+import database as db
+import review
+from problems import get_problem, prefetch_problems
+
+LEVEL_GOAL = 10  # 난이도/레벨마다 풀어야 하는 문제 수
+NEXT_LEVEL = {"초급": "중급", "중급": "고급"}
+
+
+def solved_counts(user_info: Dict[str, Any], language: str, detail_level: int) -> tuple[int, int]:
+    """
+    Returns: (detail_level에서 푼 문제 수, 현재 레벨(초급/중급/고급)에서 푼 문제 수)
+    """
+    stats = data_cache.get_dashboard_stats(user_info['id'], language)
+    solved_count = stats['solved_by_detail_level'].get(detail_level, 0)
+    current_user_level = user_info.get("level", "초급")
+    level_solved_count = stats['solved_by_level'].get(current_user_level, stats['solved_by_level']["초급"])
+    return solved_count, level_solved_count
+
+
+def needs_advance(user_info: Dict[str, Any], solved_count: int, level_solved_count: int) -> bool:
+    """레벨업이나 승급 조건을 채웠는지 반환합니다. (문제를 푼 직후 advance()를 다시 불러야 하는지)"""
+    return solved_count >= LEVEL_GOAL or (user_info.get("level", "초급") in NEXT_LEVEL and level_solved_count >= LEVEL_GOAL)
+
+
+def advance(user_info: Dict[str, Any], language: str) -> Dict[str, Any]:
+    """
+    학습 화면을 열 때의 진행 규칙을 적용합니다.
+    현재 난이도에서 LEVEL_GOAL개를 풀었으면 다음 난이도로, 현재 레벨에서 LEVEL_GOAL개를 풀었으면 다음 레벨로 올립니다.
+    승급했으면 화면을 처음부터 다시 그려야 하므로 미리 받기는 하지 않고 바로 반환합니다.
+    Returns: {
+        'detail_level': 보여줄 난이도,
+        'solved_count': 그 난이도에서 푼 문제 수,
+        'level_solved_count': 현재 레벨에서 푼 문제 수,
+        'promoted_to': 승급한 레벨 (승급하지 않았으면 None),
+        'saved': 바뀐 레벨을 DB에 모두 저장했는지 여부
+    }
+    """
+    user_id = user_info['id']
+    detail_level = user_info.get("detailLevel", 1)
+    solved_count, level_solved_count = solved_counts(user_info, language, detail_level)
+    saved = True
+
+    # 같은 문제를 여러 탭에서 저장하거나 일괄 가져오기로 LEVEL_GOAL을 넘었어도 레벨업 (needs_advance와 같은 조건)
+    if solved_count >= LEVEL_GOAL:
+        detail_level += 1
+        user_info['detailLevel'] = detail_level
+        saved = db.update_user_detail_level(user_id, detail_level, language)
+        solved_count = 0
+
+    # 레벨별로 LEVEL_GOAL개 문제를 풀면 다음 레벨로 전환 (detail_level은 초기화하지 않음)
+    current_user_level = user_info.get("level", "초급")
+    next_user_level = NEXT_LEVEL.get(current_user_level)
+    progress = {
+        'detail_level': detail_level,
+        'solved_count': solved_count,
+        'level_solved_count': level_solved_count,
+        'promoted_to': None,
+        'saved': saved,
+    }
+    if next_user_level and level_solved_count >= LEVEL_GOAL:
+        user_info["level"] = next_user_level
+        progress['promoted_to'] = next_user_level
+        progress['saved'] = db.update_user_level(user_id, next_user_level) and saved
+        return progress
+
+    # 레벨업 직후 화면이 바로 뜨도록 다음 난이도의 문제 목록을 미리 받아둠
+    # (승급해도 detail_level은 그대로이므로 승급 뒤 화면도 이 목록으로 충분함)
+    prefetch_problems(detail_level + 1)
+    return progress
+
+
+def problem_list(user_info: Dict[str, Any], language: str, current_level: int,
+                 detail_level: int) -> Optional[tuple[list[tuple[int, str, str]], set[int]]]:
+    """
+    current_level의 문제 목록과 그중 푼 문제 ID를 반환합니다.
+    현재 난이도이면 solved.ac 목록, 이전 난이도이면 오늘의 복습 세트이며, 아직 열리지 않은 난이도이면 None입니다.
+    """
+    user_id = user_info['id']
+    if current_level == detail_level:
+        # 문제 목록(solved.ac)과 이 난이도에서 푼 문제(DB)를 동시에 가져옴
+        problem, solved = async_database.gather(
+            async_database.run_in_http(get_problem, current_level, 10, False),
+            async_database.run_in_db(data_cache.get_solved_problems, user_id, current_level, language),
+        )
+        return problem, {p['problem_id'] for p in solved}
+
+    if current_level < detail_level:
+        # 오늘의 복습 세트 (다시 그려도 바뀌지 않음)
+        problem = review.get_review_set(user_id, language, current_level)
+        solved_ids = data_cache.get_solved_problem_ids(user_id, [p[0] for p in problem], current_level, language)
+        return problem, solved_ids
+
+    return None
@@ -0,0 +1,264 @@
+"""
+여러 학생이 동시에 접속한 상황을 브라우저 없이 한 프로세스 안에서 흉내 내는 부하 테스트입니다.
+
+세션마다 스레드 하나가 streamlit_app.py와 같은 순서로 함수를 호출합니다.
+(회원가입 → verify_user 로그인 → 대시보드 → 학습 화면 → 문제 해결 → 레벨업 반복)
+Streamlit도 세션마다 별도 스레드에서 스크립트를 실행하므로, 한 프로세스가 버틸 수 있는 동시 접속 수를
+가늠하는 데 사용합니다. solved.ac 대신 bench.py의 로컬 서버를, codedu.db 대신 임시 DB를 사용합니다.
+
+처리량, 단계별 지연 시간(p50/p95/p99), 단계별 실패 수, database 모듈이 삼킨 sqlite3 오류 수,
+busy_timeout 안에 잠금을 얻지 못해 실패한 쓰기(database is locked) 수, 연결 풀 대기 횟수를 출력합니다.
+(잠금을 기다렸다가 결국 성공한 경우는 잠금 실패로 세지 않습니다.)
+
+사용법:
+    python loadtest.py [--sessions 50] [--solves 25] [--think-ms 0] [--latency-ms 30]
+                       [--background-users 200] [--profile concurrent] [--pool-size 8]
+                       [--write-behind] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Optional, Dict, Any
+
+import async_database
+import bench
+import data_cache
+import database as db
+import learning
+
+
+class LoadStats:
+    """단계별 지연 시간과 실패를 모읍니다."""
+
+    def __init__(self):
+        self.timings: Dict[str, list[float]] = defaultdict(list)
+        self.failures: Dict[str, int] = defaultdict(int)
+        self.exceptions: Dict[str, int] = defaultdict(int)  # "단계: 예외 종류" -> 횟수
+        self._lock = threading.Lock()
+
+    def record(self, step: str, elapsed: float, ok: bool):
+        with self._lock:
+            self.timings[step].append(elapsed)
+            if not ok:
+                self.failures[step] += 1
+
+    def record_exception(self, step: str, error: Exception):
+        with self._lock:
+            self.failures[step] += 1
+            self.exceptions[f"{step}: {type(error).__name__}: {error}"] += 1
+
+
+class StudentSession:
+    """학생 한 명의 세션입니다. user_info는 Streamlit의 session_state.user_info에 해당합니다."""
+
+    def __init__(self, name: str, stats: LoadStats, rng: random.Random, think_time: float = 0.0):
+        self.name = name
+        self.stats = stats
+        self.rng = rng
+        self.think_time = think_time
+        self.user_info: Optional[Dict[str, Any]] = None
+        self.language = "Python"
+
+    def step(self, name: str, fn) -> Any:
+        """fn을 실행해 시간을 재고, 결과가 거짓이면 실패로 기록합니다."""
+        if self.think_time:
+            time.sleep(self.rng.uniform(0, 2 * self.think_time))
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self.stats.record(name, time.perf_counter() - started, True)
+            self.stats.record_exception(name, e)
+            return None
+        self.stats.record(name, time.perf_counter() - started, bool(result))
+        return result
+
+    def register(self) -> bool:
+        result = self.step("register", lambda: db.register_user(self.name, "password", "초급")[0])
+        return bool(result)
+
+    def login(self) -> bool:
+        def run():
+            success, user_info = db.verify_user(self.name, "password")
+            if not success:
+                return False
+            user_info['detailLevel'] = data_cache.get_user_detail_level(user_info['id'], user_info['learning_language'])
+            return user_info
+
+        self.user_info = self.step("login", run) or None
+        if self.user_info:
+            self.language = self.user_info['learning_language']
+        return self.user_info is not None
+
+    def dashboard(self) -> bool:
+        def run():
+            user_id = self.user_info['id']
+            stats, _ = async_database.gather(
+                async_database.run_in_db(data_cache.get_dashboard_stats, user_id, self.language),
+                async_database.run_in_db(data_cache.get_learning_progress, user_id, self.language),
+            )
+            return stats is not None
+
+        return bool(self.step("dashboard", run))
+
+    def learning(self, review_level: Optional[int] = None) -> Optional[tuple[int, list]]:
+        """
+        show_learning()과 같은 learning 모듈 함수로 레벨업/승급을 처리하고 문제 목록을 조회합니다.
+        Returns: (보여준 난이도, [(문제 ID, 제목, URL, 해결 여부)])
+        """
+        def run():
+            progress = learning.advance(self.user_info, self.language)
+            if progress['promoted_to']:
+                # 앱은 승급하면 st.rerun()으로 화면을 처음부터 다시 그림
+                progress = learning.advance(self.user_info, self.language)
+            if not progress['saved']:
+                return None
+
+            detail_level = progress['detail_level']
+            current_level = detail_level if review_level is None else min(review_level, detail_level)
+            page = learning.problem_list(self.user_info, self.language, current_level, detail_level)
+            if not page or not page[0]:
+                return None
+            problem, solved_ids = page
+            return current_level, [(*p, p[0] in solved_ids) for p in problem]
+
+        return self.step("learning", run)
+
+    def solve(self, detail_level: int, problem: tuple) -> bool:
+        problem_id, problem_title, problem_url, _ = problem
+        return bool(self.step("solve", lambda: db.save_solved_problem(
+            self.user_info['id'], problem_id, problem_title, problem_url, detail_level, self.language)))
+
+    def run(self, solves: int) -> bool:
+        """세션 전체를 실행합니다. Returns: 끝까지 진행했는지 여부"""
+        if not (self.register() and self.login() and self.dashboard()):
+            return False
+        for _ in range(solves):
+            # 가끔 이전 난이도의 복습 세트를 엶
+            detail_level = self.user_info.get("detailLevel", 1)
+            review_level = self.rng.randint(1, detail_level - 1) if detail_level > 1 and self.rng.random() < 0.2 else None
+            page = self.learning(review_level)
+            if page is None:
+                return False
+            current_level, problem = page
+            unsolved = [p for p in problem if not p[3]]
+            if not unsolved:
+                continue
+            if not self.solve(current_level, unsolved[0]):
+                return False
+        return self.dashboard()
+
+
+def run(sessions: int = 50, solves: int = 25, think_time: float = 0.0, latency: float = 0.03,
+        background_users: int = 200, profile: str = "concurrent", pool_size: int = db.POOL_SIZE,
+        write_behind: bool = False, seed: int = 0) -> Dict[str, Any]:
+    """부하 테스트를 실행하고 결과를 반환합니다."""
+    fake = bench.FakeSolvedAc(latency)
+    stats = LoadStats()
+    completed = []
+
+    with bench.sandbox(fake) as tmpdir:
+        # 저장 프로필은 DB를 만들 때부터 적용 (WAL DB의 저널 모드를 부하 중에 바꾸지 않도록)
+        db.DATABASE_NAME = os.path.join(tmpdir, "loadtest.db")
+        db.configure_pool(pool_size, profile=profile)
+        bench.seed_database(db.DATABASE_NAME, background_users, 100, seed)
+        data_cache.cache.clear()
+        db.reset_error_counts()
+        if write_behind:
+            db.enable_write_behind()
+
+        # 모든 세션이 동시에 시작하도록 맞춤
+        barrier = threading.Barrier(sessions + 1)
+
+        def session_main(index: int):
+            session = StudentSession(f"load{seed}_{index}", stats, random.Random(seed * 100003 + index), think_time)
+            barrier.wait()
+            if session.run(solves):
+                completed.append(index)
+
+        threads = [threading.Thread(target=session_main, args=(i,), daemon=True) for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        if write_behind:
+            db.flush_writes()
+        elapsed = time.perf_counter() - started
+
+        pool = db.get_pool()
+        write_behind_queue = db._get_write_behind()
+        result = {
+            "sessions": sessions,
+            "completed_sessions": len(completed),
+            "elapsed_s": elapsed,
+            "requests": sum(len(t) for t in stats.timings.values()),
+            "requests_per_s": sum(len(t) for t in stats.timings.values()) / elapsed if elapsed else 0.0,
+            "sessions_per_s": len(completed) / elapsed if elapsed else 0.0,
+            "steps": [
+                {**bench.summarize(step, stats.timings[step]), "failures": stats.failures.get(step, 0)}
+                for step in ("register", "login", "dashboard", "learning", "solve") if step in stats.timings
+            ],
+            "exceptions": dict(stats.exceptions),
+            "db_errors": db.get_error_counts(),
+            "pool_waits": pool.waits,
+            "pool_wait_s": pool.wait_time,
+            "write_behind_failed": write_behind_queue.failed_writes if write_behind_queue else 0,
+            "http_requests": fake.requests,
+        }
+        if write_behind:
+            db.disable_write_behind()
+    return result
+
+
+def print_report(result: Dict[str, Any]):
+    print(f"세션 {result['sessions']}개 중 {result['completed_sessions']}개 완료, {result['elapsed_s']:.2f}초")
+    print(f"처리량: 요청 {result['requests_per_s']:.1f}개/초, 세션 {result['sessions_per_s']:.2f}개/초 "
+          f"(요청 {result['requests']}개, solved.ac 요청 {result['http_requests']}개)")
+    print()
+    print(f"{'step':<10}  {'n':>6}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'failures':>8}")
+    for step in result["steps"]:
+        print(f"{step['name']:<10}  {step['n']:>6}  {step['p50_ms']:>9.2f}  {step['p95_ms']:>9.2f}  "
+              f"{step['p99_ms']:>9.2f}  {step['failures']:>8}")
+    print()
+    errors = result["db_errors"]
+    print(f"sqlite3 오류: {sum(errors['errors'].values())}개 (그중 잠금 대기 시간 초과로 실패 {errors['locked']}개)")
+    for operation, count in sorted(errors["errors"].items()):
+        print(f"  {operation}: {count}")
+    print(f"연결 풀 대기: {result['pool_waits']}회, 합계 {result['pool_wait_s']:.2f}초")
+    if result["write_behind_failed"]:
+        print(f"쓰기 지연 큐 실패: {result['write_behind_failed']}개")
+    for message, count in sorted(result["exceptions"].items()):
+        print(f"예외 {count}회 - {message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CodEdu 동시 접속 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=50, help="동시 세션 수")
+    parser.add_argument("--solves", type=int, default=25, help="세션당 해결할 문제 수")
+    parser.add_argument("--think-ms", type=float, default=0, help="단계 사이 평균 대기 시간 (ms)")
+    parser.add_argument("--latency-ms", type=float, default=30, help="가짜 solved.ac 응답 지연 (ms)")
+    parser.add_argument("--background-users", type=int, default=200, help="미리 채워 둘 사용자 수")
+    parser.add_argument("--profile", default="concurrent", choices=sorted(db.STORAGE_PROFILES), help="SQLite 저장 프로필")
+    parser.add_argument("--pool-size", type=int, default=db.POOL_SIZE, help="연결 풀 크기")
+    parser.add_argument("--write-behind", action="store_true", help="쓰기 지연 큐 사용")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    result = run(args.sessions, args.solves, args.think_ms / 1000, args.latency_ms / 1000,
+                 args.background_users, args.profile, args.pool_size, args.write_behind)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+    return 0 if result["completed_sessions"] == result["sessions"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+codedu.db 관리 명령입니다.
+
+사용법:
+    python manage.py migrate
+    python manage.py rebuild-counters [--user-id ID]
+    python manage.py import {users,learning_progress,solved_problems} FILE [--format csv|jsonl|parquet] [--chunk-size N] [--password-iterations N [--insecure]]
+    python manage.py export {users,learning_progress,solved_problems} FILE [--format csv|jsonl|parquet]
+
+새 학생 명단은 username,password[,level,learning_language] 열이 있는 CSV로 한 번에 등록할 수 있습니다.
+비밀번호 해시는 일부러 느리게 만든 것이라 기본 비용(PBKDF2 600000회)으로는 한 명에 0.2~0.3초가 걸립니다.
+--password-iterations로 비용을 낮춰 등록하면 명단은 빨리 들어가고, 각 학생이 처음 로그인할 때
+현재 비용으로 다시 해시됩니다. (그 전까지는 낮은 비용의 해시가 DB에 남아 있음)
+로그인하지 않는 학생의 해시는 계속 남으므로 passwords.MIN_IMPORT_ITERATIONS(10000)보다 낮은 값은 --insecure를 함께 줘야 합니다.
+사용자를 먼저 가져온 뒤 learning_progress, solved_problems를 가져오세요. (username으로 연결)
+"""
+import argparse
+import sys
+import time
+
+import bulk
+import database as db
+import passwords
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="codedu.db 관리")
+    parser.add_argument("--database", default=db.DATABASE_NAME, help="데이터베이스 파일 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("migrate", help="스키마를 최신 버전으로 맞춥니다 (배포 시 한 번 실행)")
+
+    rebuild = sub.add_parser("rebuild-counters", help="풀이 수 카운터를 solved_problems에서 다시 계산합니다")
+    rebuild.add_argument("--user-id", type=int, default=None, help="특정 사용자만 다시 계산")
+
+    import_parser = sub.add_parser("import", help="파일의 행을 테이블에 한꺼번에 넣습니다")
+    import_parser.add_argument("table", choices=sorted(bulk.COLUMNS))
+    import_parser.add_argument("path", help="가져올 파일 (.csv, .jsonl, .parquet)")
+    import_parser.add_argument("--format", choices=bulk.FORMATS, default=None, help="파일 형식 (기본: 확장자로 판단)")
+    import_parser.add_argument("--chunk-size", type=int, default=bulk.CHUNK_SIZE, help="한 트랜잭션에 넣을 행 수")
+    import_parser.add_argument("--password-iterations", type=int, default=None,
+                               help="users의 password 열을 해시할 PBKDF2 반복 횟수 (기본: 현재 설정, 첫 로그인 때 현재 비용으로 다시 해시)")
+    import_parser.add_argument("--insecure", action="store_true",
+                               help=f"--password-iterations를 {passwords.MIN_IMPORT_ITERATIONS}보다 낮게 허용 (테스트용)")
+
+    export_parser = sub.add_parser("export", help="테이블을 파일로 내보냅니다")
+    export_parser.add_argument("table", choices=sorted(bulk.COLUMNS))
+    export_parser.add_argument("path", help="저장할 파일 (.csv, .jsonl, .parquet)")
+    export_parser.add_argument("--format", choices=bulk.FORMATS, default=None, help="파일 형식 (기본: 확장자로 판단)")
+
+    args = parser.parse_args(argv)
+    db.DATABASE_NAME = args.database
+
+    if args.command == "migrate":
+        applied = db.init_database()
+        if applied:
+            print(f"마이그레이션 {', '.join(map(str, applied))}을(를) 적용했습니다. ({db.last_init_seconds:.3f}초)")
+        else:
+            print(f"스키마가 이미 최신 버전({db.SCHEMA_VERSION})입니다. ({db.last_init_seconds:.3f}초)")
+    elif args.command == "rebuild-counters":
+        started = time.time()
+        if not db.rebuild_solved_counters(args.user_id):
+            print("카운터를 다시 계산하지 못했습니다.", file=sys.stderr)
+            return 1
+        print(f"카운터를 다시 계산했습니다. ({time.time() - started:.2f}초)")
+    elif args.command == "import":
+        if args.password_iterations is not None:
+            if args.password_iterations < 1:
+                print("--password-iterations는 1 이상이어야 합니다.", file=sys.stderr)
+                return 1
+            if args.password_iterations < passwords.MIN_IMPORT_ITERATIONS and not args.insecure:
+                print(f"--password-iterations가 {passwords.MIN_IMPORT_ITERATIONS}보다 작습니다. "
+                      "로그인하지 않은 학생의 해시가 이 비용으로 남으므로, 그래도 사용하려면 --insecure를 함께 주세요.",
+                      file=sys.stderr)
+                return 1
+            passwords.configure(scheme="pbkdf2_sha256", iterations=args.password_iterations)
+        try:
+            result = bulk.import_file(args.table, args.path, args.format, args.chunk_size,
+                                      progress=lambda count: print(f"\r{count}행 처리", end="", file=sys.stderr))
+        except (bulk.BulkError, OSError) as e:
+            print(f"\n가져오지 못했습니다: {e}", file=sys.stderr)
+            return 1
+        print(file=sys.stderr)
+        print(f"{result['table']}: {result['rows']}행 중 {result['written']}행 저장, {result['skipped']}행 건너뜀 "
+              f"({result['seconds']:.2f}초, {result['rows_per_second']:.0f}행/초)")
+    elif args.command == "export":
+        try:
+            result = bulk.export_table(args.table, args.path, args.format)
+        except (bulk.BulkError, OSError) as e:
+            print(f"내보내지 못했습니다: {e}", file=sys.stderr)
+            return 1
+        print(f"{result['table']}: {result['rows']}행을 {args.path}에 저장했습니다 "
+              f"({result['seconds']:.2f}초, {result['rows_per_second']:.0f}행/초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+주요 경로의 호출 횟수, 지연 시간, 반환 행 수, 캐시 적중률, solved.ac 요청 수를 모읍니다.
+
+CODEDU_METRICS=1 일 때만 켜집니다. 꺼져 있으면 @timed는 함수를 그대로 돌려주고
+track()은 아무것도 하지 않으므로 비용이 거의 없습니다. (모듈을 불러오기 전에 환경 변수를 지정해야 함)
+
+결과는 Prometheus 텍스트 형식(prometheus_text) 또는 JSON(snapshot)으로 볼 수 있고,
+CODEDU_METRICS_PORT를 지정하면 streamlit_app이 /metrics, /metrics.json 엔드포인트를 띄웁니다.
+"""
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional, Dict, Any, Callable
+
+ENABLED = os.environ.get("CODEDU_METRICS", "0") == "1"
+METRICS_PORT = os.environ.get("CODEDU_METRICS_PORT")
+
+# 지연 시간 히스토그램 구간 (초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class CallStats:
+    """함수 하나의 호출 통계입니다."""
+
+    __slots__ = ("calls", "errors", "rows", "total", "max", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0  # 예외가 밖으로 나간 횟수
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # 마지막 칸은 +Inf
+
+    def observe(self, elapsed: float, rows: Optional[int], failed: bool):
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[bisect.bisect_left(BUCKETS, elapsed)] += 1
+        if rows is not None:
+            self.rows += rows
+        if failed:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """히스토그램에서 q 분위수의 상한을 어림합니다. (초)"""
+        target = q * self.calls
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+_stats: Dict[str, CallStats] = {}
+_stats_lock = threading.Lock()
+# 스냅샷을 만들 때 호출할 함수 목록 - fn() -> [(이름, {라벨: 값}, 값)]
+_collectors: list = []
+
+
+def observe(name: str, elapsed: float, rows: Optional[int] = None, failed: bool = False):
+    """name의 호출 한 번을 기록합니다."""
+    with _stats_lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = CallStats()
+        stats.observe(elapsed, rows, failed)
+
+
+def timed(name: str, rows: bool = False):
+    """
+    함수의 호출 횟수와 지연 시간을 기록하는 데코레이터입니다.
+    rows=True이면 반환값의 길이(len)를 반환 행 수로 기록합니다.
+    꺼져 있으면 함수를 그대로 반환합니다.
+    """
+    def decorator(fn: Callable) -> Callable:
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                observe(name, time.perf_counter() - started, failed=True)
+                raise
+            count = None
+            if rows:
+                try:
+                    count = len(result)
+                except TypeError:
+                    pass
+            observe(name, time.perf_counter() - started, count)
+            return result
+
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def _track(name: str):
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        # st.rerun(), st.stop()이 던지는 제어 흐름 예외(BaseException)는 실패로 세지 않음
+        observe(name, time.perf_counter() - started, failed=failed)
+
+
+def track(name: str):
+    """with 블록의 실행 시간을 기록합니다. (꺼져 있으면 아무것도 하지 않음)"""
+    return _track(name) if ENABLED else nullcontext()
+
+
+def register_collector(collector: Callable[[], list]):
+    """
+    스냅샷을 만들 때 값을 읽어 올 함수를 등록합니다. (캐시 적중 수처럼 이미 다른 곳에서 세고 있는 값)
+    collector() -> [(이름, {라벨: 값}, 값)]
+    """
+    _collectors.append(collector)
+
+
+def _collected() -> list[tuple[str, Dict[str, str], float]]:
+    values = []
+    for collector in list(_collectors):
+        try:
+            values.extend(collector())
+        except Exception:
+            continue  # 한 collector의 오류로 전체 스냅샷이 실패하지 않도록
+    return values
+
+
+def snapshot() -> Dict[str, Any]:
+    """지금까지 모은 값을 JSON으로 바꿀 수 있는 딕셔너리로 반환합니다."""
+    with _stats_lock:
+        calls = {
+            name: {
+                'calls': s.calls,
+                'errors': s.errors,
+                'rows': s.rows,
+                'total_ms': s.total * 1000,
+                'mean_ms': s.total / s.calls * 1000 if s.calls else 0.0,
+                'p50_ms': s.quantile(0.5) * 1000,
+                'p95_ms': s.quantile(0.95) * 1000,
+                'max_ms': s.max * 1000,
+            }
+            for name, s in sorted(_stats.items())
+        }
+
+    gauges: Dict[str, Any] = {}
+    for name, labels, value in _collected():
+        if labels:
+            key = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+            gauges.setdefault(name, {})[key] = value
+        else:
+            gauges[name] = value
+    return {'enabled': ENABLED, 'calls': calls, 'gauges': gauges}
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def prometheus_text() -> str:
+    """Prometheus 텍스트 형식으로 반환합니다."""
+    lines = []
+    with _stats_lock:
+        items = [(name, s.calls, s.errors, s.rows, s.total, list(s.buckets)) for name, s in sorted(_stats.items())]
+
+    lines.append("# TYPE codedu_call_seconds histogram")
+    for name, calls, _, _, total, buckets in items:
+        cumulative = 0
+        for bound, count in zip(BUCKETS, buckets):
+            cumulative += count
+            lines.append(f'codedu_call_seconds_bucket{{fn="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'codedu_call_seconds_bucket{{fn="{name}",le="+Inf"}} {calls}')
+        lines.append(f'codedu_call_seconds_sum{{fn="{name}"}} {total}')
+        lines.append(f'codedu_call_seconds_count{{fn="{name}"}} {calls}')
+    lines.append("# TYPE codedu_call_errors_total counter")
+    for name, _, errors, _, _, _ in items:
+        lines.append(f'codedu_call_errors_total{{fn="{name}"}} {errors}')
+    lines.append("# TYPE codedu_call_rows_total counter")
+    for name, _, _, rows, _, _ in items:
+        lines.append(f'codedu_call_rows_total{{fn="{name}"}} {rows}')
+
+    declared = set()
+    for name, labels, value in _collected():
+        metric = f"codedu_{name}"
+        if metric not in declared:
+            declared.add(metric)
+            lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{_labels(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """모은 호출 통계를 지웁니다. (collector 값은 각 모듈이 관리)"""
+    with _stats_lock:
+        _stats.clear()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def _handler_class():
+    # http.server는 불러오는 비용이 커서 엔드포인트를 띄울 때만 불러옴
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0].rstrip("/")
+            if path == "/metrics":
+                body, content_type = prometheus_text().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+            elif path == "/metrics.json":
+                body, content_type = json.dumps(snapshot(), ensure_ascii=False).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return MetricsHandler
+
+
+def start_http_server(port: int, host: str = "127.0.0.1"):
+    """
+    /metrics(Prometheus)와 /metrics.json을 제공하는 서버를 백그라운드 스레드로 띄웁니다.
+    프로세스당 한 번만 띄우며, 이미 떠 있으면 그 서버를 반환합니다.
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            from http.server import ThreadingHTTPServer
+
+            server = ThreadingHTTPServer((host, port), _handler_class())
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="codedu-metrics", daemon=True).start()
+            _server = server
+        return _server
@@ -0,0 +1,209 @@
+"""
+비밀번호 해시를 만들고 확인합니다.
+
+솔트를 붙인 PBKDF2-SHA256(기본) 또는 scrypt를 사용하며, 비용은 환경 변수로 정합니다.
+    CODEDU_PASSWORD_SCHEME    : pbkdf2_sha256 (기본) 또는 scrypt
+    CODEDU_PBKDF2_ITERATIONS  : PBKDF2 반복 횟수 (기본 600000)
+    CODEDU_SCRYPT_N           : scrypt 비용 N (기본 16384, r=8, p=1)
+    CODEDU_PASSWORD_WORKERS   : 동시에 해시를 계산할 작업자 수 (기본 CPU 수 - 1, 1~4) - 0이면 호출한 스레드에서 계산
+    CODEDU_PASSWORD_POOL      : 작업자 종류 thread (기본) 또는 process
+
+저장 형식은 "방식$비용$솔트$해시"이며 비용이 들어 있으므로 설정을 바꿔도 예전 해시를 확인할 수 있습니다.
+예전 형식(솔트 없는 SHA-256 16진수)도 확인할 수 있고, needs_rehash()가 True를 반환하므로
+로그인할 때 새 형식으로 바꿔 저장합니다. (database.verify_user)
+
+해시 계산은 한 번에 수백 ms가 걸리도록 일부러 느리게 만든 것이므로, 한 반이 동시에 로그인해도
+CPU를 모두 쓰지 않도록 크기가 정해진 작업자 풀에서 계산합니다. (나머지 로그인은 차례를 기다림)
+hashlib의 pbkdf2_hmac과 scrypt는 계산하는 동안 GIL을 놓으므로 스레드로도 다른 세션의 처리를 막지 않습니다.
+process는 spawn으로 작업 프로세스를 띄우므로 작업자마다 인터프리터를 새로 시작해 이 모듈을 다시 불러오는 비용과 메모리가 들고,
+python 스크립트.py로 실행한 경우에는 그 스크립트도 다시 불러오므로 `if __name__ == "__main__":`으로 보호되어 있어야 합니다.
+(streamlit run에서는 __main__이 streamlit 명령이므로 streamlit_app.py가 다시 실행되지는 않음)
+"""
+import atexit
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import metrics
+
+SCHEMES = ("pbkdf2_sha256", "scrypt")
+SCHEME = os.environ.get("CODEDU_PASSWORD_SCHEME", "pbkdf2_sha256")
+PBKDF2_ITERATIONS = int(os.environ.get("CODEDU_PBKDF2_ITERATIONS", "600000"))
+# 명단 일괄 등록처럼 비용을 일시적으로 낮출 때 허용하는 최소 반복 횟수 (manage.py import --password-iterations)
+MIN_IMPORT_ITERATIONS = 10000
+SCRYPT_N = int(os.environ.get("CODEDU_SCRYPT_N", "16384"))
+SCRYPT_R = 8
+SCRYPT_P = 1
+WORKERS = int(os.environ.get("CODEDU_PASSWORD_WORKERS", str(max(1, min(4, (os.cpu_count() or 1) - 1)))))
+POOL = os.environ.get("CODEDU_PASSWORD_POOL", "thread")
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _derive(scheme: str, cost: tuple[int, ...], password: str, salt: bytes) -> bytes:
+    if scheme == "pbkdf2_sha256":
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, cost[0], HASH_BYTES)
+    if scheme == "scrypt":
+        n, r, p = cost
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES)
+    raise ValueError(f"알 수 없는 해시 방식입니다: {scheme}")
+
+
+def _current_cost(scheme: str) -> tuple[int, ...]:
+    if scheme == "scrypt":
+        return (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return (PBKDF2_ITERATIONS,)
+
+
+def _parse(stored: str) -> Optional[tuple[str, tuple[int, ...], bytes, bytes]]:
+    """저장된 해시를 (방식, 비용, 솔트, 해시)로 나눕니다. 예전 SHA-256 형식이나 잘못된 값이면 None"""
+    parts = stored.split("$")
+    if len(parts) < 4 or parts[0] not in SCHEMES:
+        return None
+    try:
+        return parts[0], tuple(int(value) for value in parts[1:-2]), _b64decode(parts[-2]), _b64decode(parts[-1])
+    except ValueError:
+        return None
+
+
+# 아래 두 함수는 작업 프로세스에서도 실행되므로 설정값을 인자로 받습니다.
+
+def _hash(password: str, scheme: str, cost: tuple[int, ...]) -> str:
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _derive(scheme, cost, password, salt)
+    return "$".join([scheme, *map(str, cost), _b64encode(salt), _b64encode(digest)])
+
+
+def _verify(password: str, stored: str) -> bool:
+    parsed = _parse(stored)
+    if parsed is None:
+        # 예전 형식: 솔트 없는 SHA-256
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+    scheme, cost, salt, digest = parsed
+    return hmac.compare_digest(_derive(scheme, cost, password, salt), digest)
+
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> Optional[Executor]:
+    global _executor
+    if WORKERS <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if POOL == "process":
+                    # fork는 Streamlit처럼 스레드가 많은 프로세스에서 안전하지 않으므로 spawn 사용
+                    _executor = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="codedu-password")
+    return _executor
+
+
+def _run(fn, *args):
+    """fn을 작업자 풀에서 실행합니다. 풀을 쓸 수 없으면 호출한 스레드에서 실행합니다."""
+    executor = _get_executor()
+    if executor is None:
+        return fn(*args)
+    try:
+        return executor.submit(fn, *args).result()
+    except (BrokenProcessPool, RuntimeError):
+        # 작업 프로세스가 죽었거나 종료 중인 풀 - 다음 호출에서 새로 만듦
+        _reset_executor(executor)
+        return fn(*args)
+
+
+def _reset_executor(executor: Optional[Executor] = None):
+    global _executor
+    with _executor_lock:
+        if executor is None or _executor is executor:
+            old, _executor = _executor, None
+        else:
+            old = None
+    if old is not None:
+        old.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(_reset_executor)
+
+
+def configure(scheme: Optional[str] = None, iterations: Optional[int] = None,
+              scrypt_n: Optional[int] = None, workers: Optional[int] = None, pool: Optional[str] = None):
+    """해시 방식과 비용, 작업자 수와 종류를 바꿉니다. (벤치마크용, 이후 로그인부터 새 비용으로 다시 해시)"""
+    global SCHEME, PBKDF2_ITERATIONS, SCRYPT_N, WORKERS, POOL
+    if scheme is not None:
+        if scheme not in SCHEMES:
+            raise ValueError(f"알 수 없는 해시 방식입니다: {scheme}")
+        SCHEME = scheme
+    if iterations is not None:
+        PBKDF2_ITERATIONS = iterations
+    if scrypt_n is not None:
+        SCRYPT_N = scrypt_n
+    if (workers is not None and workers != WORKERS) or (pool is not None and pool != POOL):
+        WORKERS = WORKERS if workers is None else workers
+        POOL = POOL if pool is None else pool
+        _reset_executor()
+
+
+@metrics.timed("passwords.hash_password")
+def hash_password(password: str) -> str:
+    """현재 설정으로 솔트를 붙인 해시를 만듭니다."""
+    return _run(_hash, password, SCHEME, _current_cost(SCHEME))
+
+
+def hash_passwords(plain_passwords: list[str]) -> list[str]:
+    """여러 비밀번호를 작업자에게 나눠 해시합니다. (명단 일괄 등록용)"""
+    executor = _get_executor()
+    cost = _current_cost(SCHEME)
+    count = len(plain_passwords)
+    if executor is None or count < 2:
+        return [_hash(password, SCHEME, cost) for password in plain_passwords]
+    try:
+        return list(executor.map(_hash, plain_passwords, [SCHEME] * count, [cost] * count,
+                                 chunksize=max(1, count // (WORKERS * 4))))
+    except (BrokenProcessPool, RuntimeError):
+        _reset_executor(executor)
+        return [_hash(password, SCHEME, cost) for password in plain_passwords]
+
+
+# 없는 아이디로 로그인할 때도 같은 시간이 걸리도록 비교에 쓰는 해시
+_dummy_hash: Optional[str] = None
+
+
+@metrics.timed("passwords.verify_password")
+def verify_password(password: str, stored: Optional[str]) -> bool:
+    """
+    비밀번호가 저장된 해시와 맞는지 확인합니다.
+    stored가 None(없는 사용자)이어도 해시를 한 번 계산한 뒤 False를 반환해, 응답 시간으로 아이디 존재 여부를 알 수 없게 합니다.
+    """
+    global _dummy_hash
+    if stored is None:
+        if _dummy_hash is None or needs_rehash(_dummy_hash):
+            _dummy_hash = _run(_hash, secrets.token_hex(8), SCHEME, _current_cost(SCHEME))
+        _run(_verify, password, _dummy_hash)
+        return False
+    return _run(_verify, password, stored)
+
+
+def needs_rehash(stored: str) -> bool:
+    """예전 형식이거나 현재 설정과 방식/비용이 다른 해시이면 True를 반환합니다."""
+    parsed = _parse(stored)
+    return parsed is None or parsed[0] != SCHEME or parsed[1] != _current_cost(SCHEME)
@@ -0,0 +1,147 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Callable
+
+CACHE_DATABASE_NAME = "problem_cache.db"
+DEFAULT_TTL = 6 * 60 * 60  # 6시간 (초)
+DEFAULT_MAX_ENTRIES = 2000  # 디스크에 보관할 최대 페이지 수
+DEFAULT_MAX_MEMORY_ENTRIES = 200  # 메모리에 보관할 최대 페이지 수
+
+
+class ProblemCache:
+    """
+    solved.ac 문제 검색 결과를 (tier, page) 단위로 보관하는 캐시입니다.
+    메모리(LRU)와 디스크(SQLite) 두 단계로 저장하며, TTL이 지난 항목은 만료됩니다.
+    """
+
+    def __init__(self, path: Optional[str] = CACHE_DATABASE_NAME, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_memory_entries: int = DEFAULT_MAX_MEMORY_ENTRIES,
+                 serialize: Callable[[Any], Any] = lambda value: value,
+                 deserialize: Callable[[Any], Any] = lambda data: data):
+        """serialize/deserialize: 디스크에 JSON으로 저장할 때 값을 변환하는 함수"""
+        self.path = path
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict[tuple[str, int], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _get_disk(self) -> Optional[sqlite3.Connection]:
+        """디스크 캐시 연결을 반환합니다. (path가 None이면 메모리만 사용)"""
+        if self.path is None:
+            return None
+        if self._conn is None:
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS problem_pages (
+                        tier TEXT NOT NULL,
+                        page INTEGER NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        items TEXT NOT NULL,
+                        PRIMARY KEY (tier, page)
+                    )
+                """)
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error:
+                # 디스크 캐시를 쓸 수 없으면 메모리 캐시만 사용
+                self.path = None
+                return None
+        return self._conn
+
+    def _remember(self, key: tuple[str, int], fetched_at: float, items: Any):
+        """메모리 캐시에 저장하고 크기 제한을 넘으면 가장 오래 쓰지 않은 항목을 버립니다."""
+        self._memory[key] = (fetched_at, items)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, tier: str, page: int) -> Optional[Any]:
+        """캐시된 페이지를 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        with self._lock:
+            items = self._lookup((tier, page))
+            if items is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return items
+
+    def _lookup(self, key: tuple[str, int]) -> Optional[Any]:
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if now - entry[0] < self.ttl:
+                self._memory.move_to_end(key)
+                return entry[1]
+            del self._memory[key]
+
+        conn = self._get_disk()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT fetched_at, items FROM problem_pages WHERE tier = ? AND page = ?",
+                key
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or now - row[0] >= self.ttl:
+            return None
+
+        try:
+            items = self.deserialize(json.loads(row[1]))
+        except (ValueError, TypeError, KeyError):
+            return None  # 형식이 다른 이전 항목은 없는 것으로 취급
+        self._remember(key, row[0], items)
+        return items
+
+    def set(self, tier: str, page: int, items: Any):
+        """페이지를 캐시에 저장합니다."""
+        key = (tier, page)
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, items)
+
+            conn = self._get_disk()
+            if conn is None:
+                return
+            try:
+                conn.execute("""
+                    INSERT OR REPLACE INTO problem_pages (tier, page, fetched_at, items)
+                    VALUES (?, ?, ?, ?)
+                """, (tier, page, now, json.dumps(self.serialize(items), ensure_ascii=False)))
+                # 만료된 항목을 지우고, 그래도 크기 제한을 넘으면 오래된 순으로 제거
+                conn.execute("DELETE FROM problem_pages WHERE fetched_at < ?", (now - self.ttl,))
+                conn.execute("""
+                    DELETE FROM problem_pages WHERE rowid IN (
+                        SELECT rowid FROM problem_pages
+                        ORDER BY fetched_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+                conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def clear(self):
+        """메모리와 디스크 캐시를 모두 비웁니다."""
+        with self._lock:
+            self._memory.clear()
+            conn = self._get_disk()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM problem_pages")
+                conn.commit()
+            except sqlite3.Error:
+                pass
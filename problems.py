@@ -0,0 +1,277 @@
+import random
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any
+import metrics
+from catalog import load_catalog, PAGE_SIZE
+from problem_cache import ProblemCache
+from solvedac_client import get_client, SolvedAcError
+
+CONCURRENT_FETCH = True  # 여러 페이지가 필요할 때 병렬로 요청
+REVIEW_POOL_PAGES = 10  # 복습 문제 후보로 쓸 검색 결과 페이지 수
+FETCH_WORKERS = 4  # 동시에 진행할 최대 요청 수 (모든 세션이 공유)
+
+tier_list = [
+    "bronze5", "bronze4", "bronze3", "bronze2", "bronze1",
+    "silver5", "silver4", "silver3", "silver2", "silver1",
+    "gold5", "gold4", "gold3", "gold2", "gold1",
+    "platinum5", "platinum4", "platinum3", "platinum2", "platinum1",
+    "diamond5", "diamond4", "diamond3", "diamond2", "diamond1",
+    "ruby5", "ruby4", "ruby3", "ruby2", "ruby1"
+]
+
+class ProblemRecord:
+    """문제 하나 (URL은 필요할 때 만듭니다)"""
+    __slots__ = ("problem_id", "level", "title")
+
+    def __init__(self, problem_id: int, level: int, title: str):
+        self.problem_id = problem_id
+        self.level = level
+        self.title = title
+
+    @property
+    def url(self) -> str:
+        return f"https://www.acmicpc.net/problem/{self.problem_id}"
+
+    def __repr__(self) -> str:
+        return f"ProblemRecord({self.problem_id}, {self.level}, {self.title!r})"
+
+
+class ProblemPage:
+    """
+    검색 결과 한 페이지를 배열로 보관합니다.
+    문제 ID와 레벨은 배열에, 제목은 하나의 문자열과 시작 위치 배열에 저장합니다.
+    """
+    __slots__ = ("ids", "levels", "title_offsets", "titles")
+
+    def __init__(self, problems: list[tuple[int, int, str]] = ()):
+        self.ids = array("i", [p[0] for p in problems])
+        self.levels = bytes(p[1] for p in problems)
+        self.title_offsets = array("I", [0])
+        for p in problems:
+            self.title_offsets.append(self.title_offsets[-1] + len(p[2]))
+        self.titles = "".join(p[2] for p in problems)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def record(self, i: int) -> ProblemRecord:
+        return ProblemRecord(self.ids[i], self.levels[i], self.titles[self.title_offsets[i]:self.title_offsets[i + 1]])
+
+    def matching(self, level: int) -> list[ProblemRecord]:
+        """level에 해당하는 문제만 반환합니다."""
+        return [self.record(i) for i in range(len(self.ids)) if self.levels[i] == level]
+
+    def to_json(self) -> list:
+        return [[self.ids[i], self.levels[i], self.titles[self.title_offsets[i]:self.title_offsets[i + 1]]]
+                for i in range(len(self.ids))]
+
+    @classmethod
+    def from_json(cls, data: list) -> "ProblemPage":
+        # 이전 버전 캐시에는 solved.ac 응답 항목이 그대로 저장되어 있음
+        return cls([_project_item(p) if isinstance(p, dict) else tuple(p) for p in data])
+
+
+def _project_item(obj: dict) -> Any:
+    """
+    JSON을 파싱하면서 필요한 필드만 남깁니다. (json의 object_hook)
+    문제 항목은 (문제 ID, 레벨, 제목) 튜플로 바꾸고, 태그/다국어 제목 등 나머지 객체는 버립니다.
+    """
+    if "problemId" in obj and "level" in obj:
+        return (obj["problemId"], obj["level"], obj.get("titleKo") or "")
+    if "items" in obj:
+        return obj
+    return None
+
+
+# Streamlit은 매 상호작용마다 스크립트를 다시 실행하므로
+# 캐시는 한 번만 import되는 이 모듈에 둡니다.
+problem_cache = ProblemCache(serialize=ProblemPage.to_json, deserialize=ProblemPage.from_json)
+_fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="solvedac-fetch")
+# 미리 받기는 화면 요청을 방해하지 않도록 한 번에 하나씩 진행
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="problem-prefetch")
+_prefetching: set[tuple[int, int]] = set()
+_prefetch_lock = threading.Lock()
+
+
+def _metric_values() -> list:
+    """metrics 스냅샷에 넣을 문제 캐시 적중 수"""
+    return [
+        ("problem_cache_hits", {}, problem_cache.hits),
+        ("problem_cache_misses", {}, problem_cache.misses),
+        ("problem_cache_memory_entries", {}, len(problem_cache._memory)),
+    ]
+
+metrics.register_collector(_metric_values)
+
+
+def level_to_tier(level: int) -> str:
+    """레벨을 tier로 변환 (레벨 1-30)
+    레벨 1 = 티어 1 (Bronze V) = bronze5
+    레벨 2 = 티어 2 (Bronze IV) = bronze4
+    ...
+    레벨 5 = 티어 5 (Bronze I) = bronze1
+    레벨 6 = 티어 6 (Silver V) = silver5
+    ...
+    """
+    if 1 <= level <= 30:
+        return tier_list[level - 1]  # 레벨 1 -> 인덱스 0 (bronze5), 레벨 5 -> 인덱스 4 (bronze1)
+    else:
+        return "bronze5"  # 기본값
+
+@metrics.timed("problems.fetch_problem_page", rows=True)
+def fetch_problem_page(tier: str, page: int) -> ProblemPage:
+    """
+    tier의 검색 결과 한 페이지를 반환합니다. (캐시에 있으면 네트워크를 사용하지 않음)
+    요청이 실패하면 빈 페이지를 반환하며, 실패한 결과는 캐시하지 않습니다.
+    """
+    problems = problem_cache.get(tier, page)
+    if problems is None:
+        try:
+            res = get_client().search_problems(f"tier:{tier}", page, object_hook=_project_item)
+        except SolvedAcError:
+            return ProblemPage()
+        # items가 없는 응답은 최상위 객체도 _project_item에서 None이 되므로 실패와 같이 처리
+        items = res.get("items") if isinstance(res, dict) else None
+        if not isinstance(items, list):
+            return ProblemPage()
+        problems = ProblemPage([p for p in items if p is not None])
+        problem_cache.set(tier, page, problems)
+    return problems
+
+def _collect_problems(tier: str, level: int, first_page: int, last_page: int, count: int, concurrent: bool) -> list[ProblemRecord]:
+    """
+    first_page부터 last_page까지 페이지 순서대로 level에 맞는 문제를 모읍니다.
+    count개가 모이거나 빈 페이지를 만나면 중단합니다.
+    concurrent가 True이면 첫 페이지로 부족할 때 나머지 페이지를 병렬로 요청합니다.
+    """
+    problems = []
+    if not concurrent:
+        for page in range(first_page, last_page + 1):
+            items = fetch_problem_page(tier, page)
+            # 해당 레벨의 문제만 필터링
+            problems.extend(items.matching(level))
+            if len(problems) >= count or len(items) == 0:
+                break
+        return problems
+
+    # 대부분은 첫 페이지로 충분하므로 먼저 한 페이지만 요청
+    items = fetch_problem_page(tier, first_page)
+    problems.extend(items.matching(level))
+    if len(problems) >= count or len(items) == 0 or first_page >= last_page:
+        return problems
+
+    # 부족하면 다음 페이지들을 최대 FETCH_WORKERS개까지 동시에 요청하고, 결과는 페이지 순서대로 사용
+    pages = iter(range(first_page + 1, last_page + 1))
+    futures = deque()
+
+    def fill():
+        while len(futures) < FETCH_WORKERS:
+            page = next(pages, None)
+            if page is None:
+                return
+            futures.append(_fetch_executor.submit(fetch_problem_page, tier, page))
+
+    try:
+        fill()
+        while futures:
+            items = futures.popleft().result()
+            problems.extend(items.matching(level))
+            if len(problems) >= count or len(items) == 0:
+                break
+            fill()
+    finally:
+        # 아직 시작하지 않은 요청은 취소
+        for future in futures:
+            future.cancel()
+    return problems
+
+@metrics.timed("problems.get_problem", rows=True)
+def get_problem(level : int, count : int, ifRandom : bool = False, concurrent : Optional[bool] = None):
+    """
+    level에 맞는 문제를 count개까지 가져옵니다.
+    Returns: [(문제 ID, 제목, URL), ...]
+    """
+    if concurrent is None:
+        concurrent = CONCURRENT_FETCH
+
+    # 로컬 스냅샷이 있으면 네트워크 없이 바로 반환
+    catalog = load_catalog()
+    if catalog is not None and catalog.level_count(level) > 0:
+        if ifRandom == True:
+            selected = catalog.sample_level(level, 10, random.randrange(1, 11))
+        else:
+            selected = catalog.problems_for_level(level, count)
+        return [(problem_id, title, f"https://www.acmicpc.net/problem/{problem_id}") for problem_id, title in selected]
+
+    # 레벨을 tier로 변환
+    tier = level_to_tier(level)
+
+    if ifRandom == True:
+        random_page = random.randrange(1, 11)
+        # 정확한 레벨로 필터링 (tier는 범위이므로), 부족하면 추가 페이지에서 가져오기
+        problems = _collect_problems(tier, level, random_page, 21, 10, concurrent)
+
+        if len(problems) == 0:
+            return []
+
+        selected = random.sample(problems, min(10, len(problems)))
+        return [(p.problem_id, p.title, p.url) for p in selected]
+
+    # tier로 검색한 후 정확한 레벨로 필터링
+    problems = _collect_problems(tier, level, 1, 20, count, concurrent)
+
+    return [(p.problem_id, p.title, p.url) for p in problems[:count]]
+
+def prefetch_problems(level: int, count: int = 10) -> bool:
+    """
+    level의 문제 목록을 백그라운드에서 미리 받아 캐시에 넣습니다.
+    Returns: 새로 예약했으면 True (이미 진행 중이거나 받을 필요가 없으면 False)
+    """
+    if not 1 <= level <= 30:
+        return False
+    catalog = load_catalog()
+    if catalog is not None and catalog.level_count(level) > 0:
+        return False  # 로컬 스냅샷에서 바로 가져올 수 있음
+
+    key = (level, count)
+    with _prefetch_lock:
+        if key in _prefetching:
+            return False
+        _prefetching.add(key)
+
+    def run():
+        try:
+            get_problem(level, count, ifRandom=False)
+        finally:
+            with _prefetch_lock:
+                _prefetching.discard(key)
+
+    _prefetch_executor.submit(run)
+    return True
+
+def get_review_candidates(level: int) -> list[tuple[int, str]]:
+    """
+    복습 문제 후보를 (문제 ID, 제목) 목록으로 반환합니다.
+    검색 결과 상위 REVIEW_POOL_PAGES 페이지(로컬 스냅샷 또는 캐시)를 사용합니다.
+    """
+    catalog = load_catalog()
+    if catalog is not None and catalog.level_count(level) > 0:
+        return catalog.problems_for_level(level, REVIEW_POOL_PAGES * PAGE_SIZE)
+
+    tier = level_to_tier(level)
+    problems = _collect_problems(tier, level, 1, REVIEW_POOL_PAGES, REVIEW_POOL_PAGES * PAGE_SIZE, CONCURRENT_FETCH)
+    return [(p.problem_id, p.title) for p in problems]
+
+def sample_review_set(level: int, seed: str, exclude_ids: set[int], count: int = 10) -> list[tuple[int, str, str]]:
+    """
+    seed가 같으면 항상 같은 결과가 나오도록 후보에서 count개를 뽑습니다.
+    exclude_ids의 문제(이미 푼 문제)는 제외합니다.
+    Returns: [(문제 ID, 제목, URL), ...]
+    """
+    candidates = sorted({problem_id: title for problem_id, title in get_review_candidates(level)
+                         if problem_id not in exclude_ids}.items())
+    selected = random.Random(seed).sample(candidates, min(count, len(candidates)))
+    return [(problem_id, title, f"https://www.acmicpc.net/problem/{problem_id}") for problem_id, title in selected]
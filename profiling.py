@@ -0,0 +1,211 @@
+"""
+streamlit_app.py의 스크립트 실행(rerun) 한 번 단위로 cProfile 결과를 남깁니다.
+
+Streamlit은 클릭할 때마다 스크립트 전체를 다시 실행하므로, 실행 한 번이 프로파일 하나가 됩니다.
+CODEDU_PROFILE 환경 변수로 켭니다.
+    0 (기본)  : 끔
+    1         : 모든 실행을 프로파일링
+    query     : 주소에 ?profile=1 이 붙은 세션의 실행만 프로파일링
+
+결과는 CODEDU_PROFILE_DIR(기본 profiles/)에 <시각>-<화면>.prof 와 요약 .txt 로 저장되며,
+가장 최근 MAX_PROFILES개만 남깁니다. 요약에는 누적 시간 상위 함수와 SQL(sqlite3)/HTTP(requests) 호출이 들어갑니다.
+
+cProfile은 스크립트를 실행하는 스레드만 측정합니다. async_database.gather()/run()으로 DB, 네트워크 스레드 풀에 넘긴
+작업(run_in_db, run_in_http)은 그 스레드에서 따로 프로파일링해 결과에 합치고, 작업별 실행 시간을 요약 맨 앞에 적습니다.
+(Python 3.12부터는 프로파일러를 프로세스에 하나만 켤 수 있어 실행 시간만 기록됨 - 이때 스크립트 스레드의 프로파일에는
+그 시간이 gather/Future.result 안에서 기다린 시간으로만 보입니다.)
+미리 받기처럼 async_database를 거치지 않는 백그라운드 스레드의 작업은 포함되지 않습니다.
+
+여러 프로파일을 합쳐 보기:
+    python profiling.py [디렉터리] [--top 30]
+"""
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Any
+
+PROFILE_MODE = os.environ.get("CODEDU_PROFILE", "0")
+PROFILE_DIR = os.environ.get("CODEDU_PROFILE_DIR", "profiles")
+MAX_PROFILES = 100  # 남겨 둘 최근 프로파일 수
+TOP_N = 25
+
+# 요약에서 따로 보여줄 SQL/HTTP 호출 (pstats 함수 이름에 대한 정규식)
+IO_PATTERN = r"sqlite3|requests[/\\]|http[/\\]client|socket"
+
+_counter = 0
+_counter_lock = threading.Lock()
+# 스레드마다 지금 프로파일링 중인 실행의 Background (profile_rerun 안에서만 있음)
+_active = threading.local()
+
+
+class Background:
+    """프로파일링 중인 실행이 다른 스레드에 넘긴 작업의 프로파일과 실행 시간입니다."""
+
+    def __init__(self):
+        self.profilers: list[cProfile.Profile] = []
+        self.timings: list[tuple[str, float]] = []  # (작업 이름, 초)
+        self._lock = threading.Lock()
+
+    def wrap(self, name: str, fn):
+        """fn을 실행하는 스레드에서 프로파일링하고 실행 시간을 기록하는 함수를 반환합니다."""
+        def call():
+            profiler: Optional[cProfile.Profile] = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                profiler = None  # 다른 프로파일러가 동작 중 - 실행 시간만 기록
+            started = time.perf_counter()
+            try:
+                return fn()
+            finally:
+                elapsed = time.perf_counter() - started
+                if profiler is not None:
+                    profiler.disable()
+                with self._lock:
+                    self.timings.append((name, elapsed))
+                    if profiler is not None:
+                        self.profilers.append(profiler)
+        return call
+
+
+def background() -> Optional[Background]:
+    """호출한 스레드가 프로파일링 중이면 다른 스레드에 넘긴 작업을 기록할 Background를 반환합니다."""
+    return getattr(_active, "background", None)
+
+
+def requested(query_params: Any = None) -> bool:
+    """이번 실행을 프로파일링할지 반환합니다. query_params는 st.query_params입니다."""
+    if PROFILE_MODE == "1":
+        return True
+    if PROFILE_MODE == "query" and query_params is not None:
+        return query_params.get("profile") == "1"
+    return False
+
+
+def summarize(stats: pstats.Stats, top: int = TOP_N) -> str:
+    """누적 시간 상위 함수와 SQL/HTTP 호출 요약을 문자열로 반환합니다."""
+    out = io.StringIO()
+    stats.stream = out
+    stats.files = []  # 구역마다 반복되는 파일 목록 머리말 생략
+    out.write(f"== 누적 시간 상위 {top}개 ==\n")
+    stats.sort_stats("cumulative").print_stats(top)
+    out.write(f"== 자체 시간 상위 {top}개 ==\n")
+    stats.sort_stats("tottime").print_stats(top)
+    out.write("== SQL/HTTP 호출 ==\n")
+    stats.sort_stats("tottime").print_stats(IO_PATTERN, top)
+    return out.getvalue()
+
+
+def _rotate(directory: str, keep: int):
+    """가장 최근 keep개의 프로파일만 남기고 지웁니다."""
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".prof"))
+    except OSError:
+        return
+    for name in names[:max(0, len(names) - keep)]:
+        for path in (os.path.join(directory, name), os.path.join(directory, name[:-5] + ".txt")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def save_profile(profiler: cProfile.Profile, label: str, elapsed: float,
+                 directory: Optional[str] = None, keep: int = MAX_PROFILES,
+                 background_work: Optional[Background] = None) -> Optional[str]:
+    """
+    프로파일과 요약을 저장하고 .prof 경로를 반환합니다. 저장하지 못하면 None을 반환합니다.
+    background_work의 다른 스레드 프로파일은 합쳐서 저장합니다.
+    """
+    global _counter
+    directory = directory or PROFILE_DIR
+    with _counter_lock:
+        _counter += 1
+        sequence = _counter
+    # 이름순 정렬이 시간순이 되도록 시각을 앞에 둠
+    base = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{sequence:06d}-{label}")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        stats = pstats.Stats(profiler)
+        timings = []
+        if background_work is not None:
+            for worker_profiler in background_work.profilers:
+                stats.add(worker_profiler)
+            timings = background_work.timings
+        stats.dump_stats(base + ".prof")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"{label}: {elapsed * 1000:.1f}ms\n\n")
+            if timings:
+                f.write("== DB/네트워크 스레드 작업 (async_database) ==\n")
+                for name, seconds in timings:
+                    f.write(f"{seconds * 1000:10.1f}ms  {name}\n")
+                f.write("\n")
+            f.write(summarize(stats))
+    except OSError:
+        return None
+    _rotate(directory, keep)
+    return base + ".prof"
+
+
+@contextmanager
+def profile_rerun(label: str, enabled: bool = True):
+    """
+    with 블록(스크립트 실행 한 번)을 프로파일링해 저장합니다.
+    st.rerun()처럼 예외로 실행이 끝나도 저장합니다.
+    """
+    if not enabled:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # 다른 프로파일러가 이미 동작 중 (Python 3.12부터는 프로세스에 하나만 가능)
+        yield
+        return
+
+    started = time.perf_counter()
+    background_work = _active.background = Background()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _active.background = None
+        save_profile(profiler, label, time.perf_counter() - started, background_work=background_work)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 실행 프로파일 합쳐 보기")
+    parser.add_argument("directory", nargs="?", default=PROFILE_DIR, help="프로파일 디렉터리")
+    parser.add_argument("--top", type=int, default=TOP_N, help="표시할 함수 수")
+    parser.add_argument("--label", default=None, help="이 화면(dashboard, learning, login)의 프로파일만 사용")
+    args = parser.parse_args(argv)
+
+    try:
+        names = sorted(name for name in os.listdir(args.directory) if name.endswith(".prof"))
+    except OSError as e:
+        print(f"디렉터리를 읽을 수 없습니다: {e}", file=sys.stderr)
+        return 1
+    if args.label:
+        names = [name for name in names if name[:-5].endswith(f"-{args.label}")]
+    if not names:
+        print("프로파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    stats = pstats.Stats(os.path.join(args.directory, names[0]))
+    for name in names[1:]:
+        stats.add(os.path.join(args.directory, name))
+    print(f"프로파일 {len(names)}개")
+    print(summarize(stats, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
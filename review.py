@@ -0,0 +1,32 @@
+"""
+복습 모드(현재 난이도보다 낮은 난이도)에서 보여줄 문제 세트를 만듭니다.
+
+세트는 사용자/언어/난이도/날짜별로 한 번만 만들어 DB에 저장하므로,
+같은 날에는 화면을 다시 그려도 같은 문제가 같은 순서로 보입니다.
+"""
+from datetime import date
+from typing import Optional
+
+import database as db
+import metrics
+from problems import sample_review_set
+
+REVIEW_SET_SIZE = 10
+
+
+@metrics.timed("review.get_review_set", rows=True)
+def get_review_set(user_id: int, language: str, detail_level: int, day: Optional[str] = None) -> list[tuple[int, str, str]]:
+    """
+    오늘의 복습 문제 세트를 반환합니다. 없으면 이미 푼 문제를 제외하고 새로 만들어 저장합니다.
+    Returns: [(문제 ID, 제목, URL), ...]
+    """
+    day = day or date.today().isoformat()
+    problems = db.get_review_set(user_id, language, detail_level, day)
+    if problems is not None:
+        return problems
+
+    solved_ids = {p['problem_id'] for p in db.get_solved_problems(user_id, detail_level, language)}
+    problems = sample_review_set(detail_level, f"{user_id}:{language}:{detail_level}:{day}", solved_ids, REVIEW_SET_SIZE)
+    if not problems:
+        return []  # 후보를 가져오지 못했으면 저장하지 않고 다음에 다시 시도
+    return db.save_review_set(user_id, language, detail_level, day, problems)
@@ -0,0 +1,162 @@
+import os
+import random
+import threading
+import time
+from typing import Optional, Dict, Any, Callable
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+API_BASE_URL = os.environ.get("SOLVEDAC_API_URL", "https://solved.ac/api/v3")
+DEFAULT_TIMEOUT = (3.05, 10)  # (연결, 읽기) 제한 시간 (초)
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5  # 첫 재시도 대기 시간 (초)
+DEFAULT_BACKOFF_MAX = 8.0  # 최대 재시도 대기 시간 (초)
+DEFAULT_RATE = 4.0  # 초당 요청 수
+DEFAULT_BURST = 8  # 한 번에 몰아서 보낼 수 있는 요청 수
+DEFAULT_POOL_SIZE = 10  # 유지할 keep-alive 연결 수
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class SolvedAcError(Exception):
+    """solved.ac 요청이 재시도 후에도 실패했을 때 발생합니다."""
+
+
+class RateLimiter:
+    """토큰 버킷 방식의 클라이언트 측 요청 속도 제한기입니다."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰을 하나 얻을 때까지 기다립니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SolvedAcClient:
+    """
+    solved.ac API 클라이언트입니다.
+    연결을 재사용(keep-alive)하고, 요청마다 제한 시간을 두며,
+    실패하면 지터를 준 지수 백오프로 재시도합니다.
+    """
+
+    def __init__(self, base_url: str = API_BASE_URL, timeout=DEFAULT_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retries = 0  # 재시도한 요청 수
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """재시도 전 대기 시간을 계산합니다. (Retry-After가 있으면 우선)"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, delay)  # full jitter
+
+    @metrics.timed("solvedac.get_json")
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None,
+                 object_hook: Optional[Callable[[dict], Any]] = None) -> Dict[str, Any]:
+        """
+        GET 요청을 보내고 JSON 응답을 반환합니다.
+        연결 오류, 시간 초과, 429/5xx, JSON이 아닌 응답은 재시도합니다.
+        object_hook을 주면 JSON 객체를 파싱하는 즉시 변환합니다. (필요한 필드만 남길 때 사용)
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                self.retries += 1
+                time.sleep(self._backoff(attempt - 1, retry_after))
+            retry_after = None
+            self.rate_limiter.acquire()
+
+            try:
+                res = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                continue
+
+            if res.status_code in RETRY_STATUS_CODES:
+                retry_after = res.headers.get("Retry-After")
+                last_error = SolvedAcError(f"HTTP {res.status_code}: {url}")
+                continue
+            if res.status_code != 200:
+                raise SolvedAcError(f"HTTP {res.status_code}: {url}")
+
+            try:
+                return res.json(object_hook=object_hook)
+            except ValueError as e:
+                # 프록시 오류 페이지 등 JSON이 아닌 응답
+                last_error = e
+                continue
+
+        raise SolvedAcError(f"solved.ac 요청 실패: {url} ({last_error})")
+
+    def search_problems(self, query: str, page: int = 1, sort: str = "solved", direction: str = "desc",
+                        object_hook: Optional[Callable[[dict], Any]] = None) -> Dict[str, Any]:
+        """문제 검색 API(/search/problem)를 호출합니다."""
+        return self.get_json("search/problem", {
+            "query": query,
+            "page": page,
+            "sort": sort,
+            "direction": direction,
+        }, object_hook)
+
+    def close(self):
+        """유지 중인 연결을 모두 닫습니다."""
+        self.session.close()
+
+
+_client: Optional[SolvedAcClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> SolvedAcClient:
+    """모든 세션이 공유하는 solved.ac 클라이언트를 반환합니다."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = SolvedAcClient()
+    return _client
+
+
+def _metric_values() -> list:
+    """metrics 스냅샷에 넣을 재시도 수"""
+    client = _client
+    return [("solvedac_retries", {}, client.retries)] if client is not None else []
+
+metrics.register_collector(_metric_values)
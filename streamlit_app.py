@@ -1,7 +1,37 @@
+import threading
+from contextlib import contextmanager
+
 import streamlit as st
+import async_database
 import database as db
-import requests
-import random
+import data_cache
+import learning
+import metrics
+import profiling
+
+# CODEDU_METRICS=1, CODEDU_METRICS_PORT=포트 로 실행하면 /metrics 엔드포인트를 띄움 (프로세스당 한 번)
+if metrics.ENABLED and metrics.METRICS_PORT:
+    metrics.start_http_server(int(metrics.METRICS_PORT))
+
+# 지금 측정 중인 화면이 있는지 (전체 실행 안에서 불린 fragment를 두 번 재지 않도록)
+_page_measure = threading.local()
+
+
+@contextmanager
+def measure_page(page):
+    """
+    화면 실행 시간(metrics의 page.* 항목)을 기록하고, CODEDU_PROFILE이 켜져 있으면 cProfile로 기록합니다. (profiling.py 참고)
+    fragment만 다시 실행될 때도 fragment 안에서 불러 측정하며, 전체 실행 안에서는 바깥 측정에 포함됩니다.
+    """
+    if getattr(_page_measure, "active", False):
+        yield
+        return
+    _page_measure.active = True
+    try:
+        with profiling.profile_rerun(page, profiling.requested(st.query_params)), metrics.track(f"page.{page}"):
+            yield
+    finally:
+        _page_measure.active = False
 
 st.title("CodEdu")
 if st.button("홈으로 돌아가기"):
@@ -22,17 +52,6 @@ if 'learning_started' not in st.session_state:
 if 'learning_language' not in st.session_state:
     st.session_state.learning_language = 'Python'
 
-tier_list = [
-    "bronze5", "bronze4", "bronze3", "bronze2", "bronze1",
-    "silver5", "silver4", "silver3", "silver2", "silver1",
-    "gold5", "gold4", "gold3", "gold2", "gold1",
-    "platinum5", "platinum4", "platinum3", "platinum2", "platinum1",
-    "diamond5", "diamond4", "diamond3", "diamond2", "diamond1",
-    "ruby5", "ruby4", "ruby3", "ruby2", "ruby1"
-]
-
-
-
 # --- 화면 함수 정의 ---
 def show_dashboard():
     st.success(f"환영합니다, {st.session_state.user_info['username']}님!")
@@ -45,8 +64,11 @@ def show_dashboard():
     # 현재 선택된 언어 표시
     st.markdown(f"**현재 학습 언어:** :blue[{st.session_state.learning_language}]")
     
-    # 학습 통계 (현재 언어별)
-    stats = db.get_user_stats(st.session_state.user_info['id'], st.session_state.learning_language)
+    # 학습 통계와 학습 진행 상태 (현재 언어별)는 서로 관계없으므로 동시에 읽음
+    stats, progress = async_database.gather(
+        async_database.run_in_db(data_cache.get_dashboard_stats, st.session_state.user_info['id'], st.session_state.learning_language),
+        async_database.run_in_db(data_cache.get_learning_progress, st.session_state.user_info['id'], st.session_state.learning_language),
+    )
     col1, col2, col3 = st.columns(3)
     with col1:
         st.metric("학습한 개념", stats['completed_chapters'])
@@ -55,8 +77,7 @@ def show_dashboard():
     with col3:
         st.metric("평균 점수", stats['average_score'])
 
-    # 학습 진행 상태 (현재 언어별)
-    progress = db.get_learning_progress(st.session_state.user_info['id'], st.session_state.learning_language)
+    # 학습 진행 상태
     if progress:
         st.subheader(f"{st.session_state.learning_language} 학습 진행 상태")
         for p in progress:
@@ -115,7 +136,7 @@ def show_login():
                 st.session_state.logged_in = True
                 st.session_state.user_info = user_info
                 # detailLevel을 데이터베이스에서 가져와서 user_info에 추가
-                detail_level = db.get_user_detail_level(user_info['id'], user_info.get('learning_language', 'Python'))
+                detail_level = data_cache.get_user_detail_level(user_info['id'], user_info.get('learning_language', 'Python'))
                 st.session_state.user_info['detailLevel'] = detail_level
                 st.success("로그인 성공!")
                 st.rerun()
@@ -148,171 +169,142 @@ def show_register():
 
 def show_learning():
     st.header("학습 시작하기")
-    # detailLevel은 user_info에 없을 수 있으므로 안전하게 접근
-    
-    detail_level = st.session_state.user_info.get("detailLevel", 1)
-    # 현재 레벨에서 풀었던 문제 수 조회
-    solved_count = db.get_solved_problems_count(
-        st.session_state.user_info['id'], 
-        detail_level,
-        st.session_state.learning_language
-    )
 
-    if solved_count == 10:
-        detail_level += 1
-        # user_info 딕셔너리 업데이트 (딕셔너리는 ['key'] 형식으로 접근)
-        st.session_state.user_info['detailLevel'] = detail_level
-        # 데이터베이스에도 저장
-        db.update_user_detail_level(
-            st.session_state.user_info['id'],
-            detail_level,
-            st.session_state.learning_language
-        )
-        solved_count = 0
-        
+    # 레벨업/승급 처리와 다음 문제 목록 미리 받기 (learning.py, 부하 테스트와 같은 규칙)
+    progress = learning.advance(st.session_state.user_info, st.session_state.learning_language)
+    if progress['promoted_to']:
+        st.success(f"축하합니다! {progress['promoted_to']} 레벨로 승급했습니다! 🎉")
+        st.rerun()
+    detail_level = progress['detail_level']
+    solved_count = progress['solved_count']
+    level_solved_count = progress['level_solved_count']
 
-    # 현재 레벨(초급/중급/고급)에서 풀었던 문제 수 조회 (레벨별)
-    current_user_level = st.session_state.user_info.get("level", "초급")
-    level_solved_count = db.get_level_problems_count(
-        st.session_state.user_info['id'],
-        current_user_level,
-        st.session_state.learning_language
-    )
+    # 카운터는 문제를 풀 때 문제 행(fragment)에서 이 자리만 다시 그림
+    stats_placeholder = st.empty()
+    write_learning_stats(stats_placeholder, detail_level, solved_count, level_solved_count)
 
-    # 레벨별로 10개 문제를 풀면 다음 레벨로 전환 (detail_level은 초기화하지 않음)
-    if level_solved_count >= 10:
-        if current_user_level == "초급":
-            st.session_state.user_info["level"] = "중급"
-            db.update_user_level(st.session_state.user_info['id'], "중급")
-            st.success("축하합니다! 중급 레벨로 승급했습니다! 🎉")
-            st.rerun()
-        elif current_user_level == "중급":
-            st.session_state.user_info["level"] = "고급"
-            db.update_user_level(st.session_state.user_info['id'], "고급")
-            st.success("축하합니다! 고급 레벨로 승급했습니다! 🎉")
-            st.rerun()
-
-    st.write("학습 수준 : " + st.session_state.user_info["level"])
-    st.write("문제 난이도 레벨 : " + str(detail_level))
-    st.write(f"현재 난이도에서 풀었던 문제 수: {solved_count}개 / 10개")
-    st.write(f"현재 레벨({current_user_level})에서 풀었던 문제 수: {level_solved_count}개 / 10개")
-
-    current_level = st.slider("난이도 선택", 1, 10, value=detail_level)
-    if current_level == detail_level:
-        problem = get_problem(current_level, 10, ifRandom = False)
-        write_problem(problem,current_level)
-    
-    elif current_level < detail_level:
-        problem = get_problem(current_level, 10, ifRandom = True)
-        write_problem(problem,current_level)
-    
-    else:
-        st.warning("아직 이 난이도가 개방되지 않았습니다")
+    # 이번 전체 실행 이후 fragment 안에서 해결한 문제 (행을 다시 그릴 때 사용)
+    st.session_state.solved_in_fragment = set()
+    st.session_state.learning_stats_stale = False
+    show_problem_list(detail_level, stats_placeholder)
 
-    
 
-def level_to_tier(level: int) -> str:
-    """레벨을 tier로 변환 (레벨 1-30)
-    레벨 1 = 티어 1 (Bronze V) = bronze5
-    레벨 2 = 티어 2 (Bronze IV) = bronze4
-    ...
-    레벨 5 = 티어 5 (Bronze I) = bronze1
-    레벨 6 = 티어 6 (Silver V) = silver5
-    ...
-    """
-    if 1 <= level <= 30:
-        return tier_list[level - 1]  # 레벨 1 -> 인덱스 0 (bronze5), 레벨 5 -> 인덱스 4 (bronze1)
-    else:
-        return "bronze5"  # 기본값
-
-def get_problem(level : int, count : int, ifRandom : bool = False):
-    # 레벨을 tier로 변환
-    tier = level_to_tier(level)
-    
-    if ifRandom == True:
-        random_page = random.randrange(1, 11)
-        url = f"https://solved.ac/api/v3/search/problem?query=tier:{tier}&page={random_page}&sort=solved&direction=desc"
-        res = requests.get(url).json()
-        # 정확한 레벨로 필터링 (tier는 범위이므로)
-        problems = [p for p in res["items"] if p["level"] == level]
-        
-        # 필터링된 문제가 부족하면 추가 페이지에서 가져오기
-        page = random_page
-        while len(problems) < 10 and page <= 20:
-            page += 1
-            url = f"https://solved.ac/api/v3/search/problem?query=tier:{tier}&page={page}&sort=solved&direction=desc"
-            res = requests.get(url).json()
-            problems.extend([p for p in res["items"] if p["level"] == level])
-            if len(res["items"]) == 0:
-                break
-        
-        if len(problems) == 0:
-            return []
-        
-        selected = random.sample(problems, min(10, len(problems)))
-        return [(p["problemId"], p["titleKo"], f"https://www.acmicpc.net/problem/{p['problemId']}") for p in selected]
-
-    # tier로 검색한 후 정확한 레벨로 필터링
-    problems = []
-    page = 1
-    while len(problems) < count and page <= 20:
-        url = f"https://solved.ac/api/v3/search/problem?query=tier:{tier}&page={page}&sort=solved&direction=desc"
-        res = requests.get(url).json()
-        # 해당 레벨의 문제만 필터링
-        filtered = [p for p in res["items"] if p["level"] == level]
-        problems.extend(filtered)
-        if len(res["items"]) == 0:
-            break
-        page += 1
-    
-    return [(p["problemId"], p["titleKo"], f"https://www.acmicpc.net/problem/{p['problemId']}") for p in problems[:count]]
+def write_learning_stats(placeholder, detail_level: int, solved_count: int, level_solved_count: int):
+    current_user_level = st.session_state.user_info.get("level", "초급")
+    with placeholder.container():
+        st.write("학습 수준 : " + st.session_state.user_info["level"])
+        st.write("문제 난이도 레벨 : " + str(detail_level))
+        st.write(f"현재 난이도에서 풀었던 문제 수: {solved_count}개 / 10개")
+        st.write(f"현재 레벨({current_user_level})에서 풀었던 문제 수: {level_solved_count}개 / 10개")
+
+
+# 난이도를 바꾸면 문제 목록만 다시 그림 (로그인 확인, 통계 조회, 레벨업 처리는 다시 하지 않음)
+@st.fragment
+def show_problem_list(detail_level, stats_placeholder):
+    with measure_page("learning.fragment"):
+        current_level = st.slider("난이도 선택", 1, 10, value=detail_level)
+        page = learning.problem_list(
+            st.session_state.user_info,
+            st.session_state.learning_language,
+            current_level,
+            detail_level
+        )
+        if page is None:
+            st.warning("아직 이 난이도가 개방되지 않았습니다")
+        else:
+            problem, solved_ids = page
+            write_problem(problem, current_level, detail_level, stats_placeholder, solved_ids)
+
+
+def write_problem(problem, current_level, detail_level, stats_placeholder, solved_ids=None):
+    # 표시할 문제들의 해결 여부를 한 번에 조회 (미리 가져온 값이 없을 때)
+    if solved_ids is None:
+        solved_ids = data_cache.get_solved_problem_ids(
+            user_id=st.session_state.user_info['id'],
+            problem_ids=[p[0] for p in problem],
+            detail_level=current_level,
+            language=st.session_state.learning_language
+        )
 
-def write_problem(problem, current_level):
     for i in range(len(problem)):
-            problem_id, problem_title, problem_url = problem[i]
-            
-            # 문제가 이미 해결되었는지 확인
-            is_solved = db.is_problem_solved(
-                user_id=st.session_state.user_info['id'],
-                problem_id=problem_id,
-                detail_level=current_level,
-                language=st.session_state.learning_language
+        write_problem_row(i, problem[i], problem[i][0] in solved_ids, current_level, detail_level, stats_placeholder)
+
+
+def solve_problem(problem, current_level):
+    """문제 해결 버튼 콜백 (버튼이 있는 fragment를 다시 실행하기 전에 호출됨)"""
+    problem_id, problem_title, problem_url = problem
+    # 문제 해결 기록 저장
+    success = db.save_solved_problem(
+        user_id=st.session_state.user_info['id'],
+        problem_id=problem_id,
+        problem_title=problem_title,
+        problem_url=problem_url,
+        detail_level=current_level,
+        language=st.session_state.learning_language
+    )
+    if success:
+        st.session_state.solved_in_fragment.add((current_level, problem_id))
+        st.session_state.learning_stats_stale = True
+    else:
+        st.session_state.solve_failed = (current_level, problem_id)
+
+
+# 문제 해결 버튼을 누르면 그 행과 카운터만 다시 그림
+@st.fragment
+def write_problem_row(i, problem, is_solved, current_level, detail_level, stats_placeholder):
+    with measure_page("learning.fragment"):
+        problem_id, problem_title, problem_url = problem
+        # fragment를 다시 실행할 때는 처음 넘겨받은 is_solved가 그대로이므로 세션 기록도 확인
+        is_solved = is_solved or (current_level, problem_id) in st.session_state.solved_in_fragment
+
+        if st.session_state.get("learning_stats_stale"):
+            st.session_state.learning_stats_stale = False
+            solved_count, level_solved_count = learning.solved_counts(
+                st.session_state.user_info,
+                st.session_state.learning_language,
+                detail_level
             )
-            
-            col1, col2 = st.columns([4, 1])
-            with col1:
-                # 해결된 문제는 회색으로 표시
-                if is_solved:
-                    st.markdown(f"{i+1}. <span style='color:gray; text-decoration:line-through;'>[{problem_title}]({problem_url}) (ID: {problem_id}) ✅</span>", unsafe_allow_html=True)
-                else:
-                    st.write(f"{i+1}. [{problem_title}]({problem_url}) (ID: {problem_id})")
-            with col2:
-                if st.button("문제 해결", key=f"solve_{problem_id}_{i}", disabled=is_solved):
-                    # 문제 해결 기록 저장
-                    success = db.save_solved_problem(
-                        user_id=st.session_state.user_info['id'],
-                        problem_id=problem_id,
-                        problem_title=problem_title,
-                        problem_url=problem_url,
-                        detail_level=current_level,
-                        language=st.session_state.learning_language
-                    )
-                    if success:
-                        st.rerun()
-                    else:
-                        st.error("문제 해결 기록 저장에 실패했습니다.")
+            # 레벨업/승급 조건을 채웠으면 전체를 다시 실행해 show_learning에서 처리
+            if learning.needs_advance(st.session_state.user_info, solved_count, level_solved_count):
+                st.rerun()
+            write_learning_stats(stats_placeholder, detail_level, solved_count, level_solved_count)
+    
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            # 해결된 문제는 회색으로 표시
+            if is_solved:
+                st.markdown(f"{i+1}. <span style='color:gray; text-decoration:line-through;'>[{problem_title}]({problem_url}) (ID: {problem_id}) ✅</span>", unsafe_allow_html=True)
+            else:
+                st.write(f"{i+1}. [{problem_title}]({problem_url}) (ID: {problem_id})")
+        with col2:
+            st.button("문제 해결", key=f"solve_{problem_id}_{i}", disabled=is_solved,
+                      on_click=solve_problem, args=(problem, current_level))
+        if st.session_state.get("solve_failed") == (current_level, problem_id):
+            del st.session_state.solve_failed
+            st.error("문제 해결 기록 저장에 실패했습니다.")
 
 
 # --- 메인 라우팅 ---
-if st.session_state.logged_in:
-    if st.session_state.home_page == True:
-        show_dashboard()
-    elif st.session_state.learning_started == True:
-        show_learning()
-
+# 화면별 실행 시간은 metrics의 page.* 항목으로 기록 (DB/solved.ac 시간과 비교용)
+# CODEDU_PROFILE이 켜져 있으면 이번 실행을 cProfile로 기록 (profiling.py 참고)
+# fragment만 다시 실행될 때는 page.learning.fragment로 따로 기록
+if not st.session_state.logged_in:
+    current_page = "login"
+elif st.session_state.home_page == True:
+    current_page = "dashboard"
 else:
-    tab1, tab2 = st.tabs(["로그인", "회원가입"])
-    with tab1:
-        show_login()
-    with tab2:
-        show_register()
\ No newline at end of file
+    current_page = "learning"
+
+with measure_page(current_page):
+    if st.session_state.logged_in:
+        if st.session_state.home_page == True:
+            show_dashboard()
+        elif st.session_state.learning_started == True:
+            show_learning()
+
+    else:
+        tab1, tab2 = st.tabs(["로그인", "회원가입"])
+        with tab1:
+            show_login()
+        with tab2:
+            show_register()